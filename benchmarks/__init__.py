@@ -0,0 +1,7 @@
+"""
+Бенчмарки API.
+
+Каждый модуль запускается из корня репозитория командой
+`python -m benchmarks.<модуль>` и работает на временной тестовой базе,
+не затрагивая db.sqlite3.
+"""
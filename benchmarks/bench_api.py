@@ -0,0 +1,220 @@
+"""
+Нагрузочный бенчмарк всех эндпоинтов /api/v1.
+
+Запросы идут через WSGI-приложение проекта в том же процессе;
+для каждого сценария считаются p50/p95/p99, запросы в секунду и
+SQL-запросы на запрос. Результат сохраняется в JSON и может
+сравниваться с сохранённым ранее прогоном:
+
+    python -m benchmarks.bench_api --output bench.json
+    python -m benchmarks.bench_api --baseline bench.json
+"""
+import argparse
+import json
+import random
+import time
+from io import BytesIO
+
+from benchmarks.seed import seed_dataset
+from benchmarks.utils import (
+    print_table, setup_django, summary, test_database
+)
+
+
+class WSGIClient:
+    """Минимальный клиент, вызывающий WSGI-приложение напрямую."""
+
+    def __init__(self, application):
+        self.application = application
+
+    def request(self, method, path, query='', data=None, token=None):
+        body = json.dumps(data).encode() if data is not None else b''
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'HTTP_HOST': 'testserver',
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': BytesIO(),
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        if token:
+            environ['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        status = []
+
+        def start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split()[0]))
+
+        result = self.application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status[0], content
+
+
+def build_scenarios(client, data, rng):
+    """Сценарии: название -> функция, выполняющая один запрос."""
+    username = 'bench_0'
+    status, content = client.request(
+        'POST', '/api/v1/jwt/create/',
+        data={'username': username, 'password': data['password']}
+    )
+    assert status == 200, content
+    tokens = json.loads(content)
+    access, refresh = tokens['access'], tokens['refresh']
+    post_ids, group_ids = data['post_ids'], data['group_ids']
+
+    def get(path, query='', token=access):
+        return lambda: client.request('GET', path, query, token=token)
+
+    def random_post(path):
+        return lambda: client.request(
+            'GET', path.format(rng.choice(post_ids)), token=access
+        )
+
+    return {
+        'posts list (anonymous)': get('/api/v1/posts/', 'limit=10',
+                                      token=None),
+        'posts list limit/offset': get(
+            '/api/v1/posts/', 'limit=10&offset=1000'),
+        'posts list cursor': get('/api/v1/posts/', 'cursor&limit=10'),
+        'posts detail': random_post('/api/v1/posts/{}/'),
+        'posts create': lambda: client.request(
+            'POST', '/api/v1/posts/', data={'text': 'Новый пост'},
+            token=access),
+        'comments list': random_post('/api/v1/posts/{}/comments/'),
+        'comments create': lambda: client.request(
+            'POST', f'/api/v1/posts/{rng.choice(post_ids)}/comments/',
+            data={'text': 'Новый комментарий'}, token=access),
+        'groups list': get('/api/v1/groups/'),
+        'groups detail': lambda: client.request(
+            'GET', f'/api/v1/groups/{rng.choice(group_ids)}/',
+            token=access),
+        'follow list': get('/api/v1/follow/'),
+        'follow search': get('/api/v1/follow/', 'search=bench_1'),
+        'feed': get('/api/v1/feed/'),
+        'jwt create': lambda: client.request(
+            'POST', '/api/v1/jwt/create/',
+            data={'username': username, 'password': data['password']}),
+        'jwt refresh': lambda: client.request(
+            'POST', '/api/v1/jwt/refresh/', data={'refresh': refresh}),
+        'jwt verify': lambda: client.request(
+            'POST', '/api/v1/jwt/verify/', data={'token': access}),
+    }
+
+
+def run_scenario(func, requests, warmup):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        func()
+    timings = []
+    errors = 0
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for _ in range(requests):
+            start = time.perf_counter()
+            status, _ = func()
+            timings.append(time.perf_counter() - start)
+            errors += status >= 400
+        total = time.perf_counter() - started
+    return {
+        **summary(timings),
+        'rps': requests / total,
+        'queries': len(queries.captured_queries) / requests,
+        'errors': errors,
+    }
+
+
+def compare(results, baseline):
+    """Строки сравнения с базовым прогоном: изменение p50/p95 и rps в %."""
+    rows = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+
+        def delta(key):
+            return (current[key] - before[key]) / before[key] * 100
+
+        rows.append({
+            'scenario': name,
+            'p50 %': delta('p50_ms'),
+            'p95 %': delta('p95_ms'),
+            'rps %': delta('rps'),
+            'queries': f"{before['queries']:.1f} -> {current['queries']:.1f}",
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=10)
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--comments', type=int, default=5000)
+    parser.add_argument('--follows', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Запросов на сценарий.')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--only', action='append',
+                        help='Запустить только сценарии с этой подстрокой.')
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument('--baseline', help='JSON прошлого прогона.')
+    options = parser.parse_args()
+
+    setup_django()
+    from django.core.wsgi import get_wsgi_application
+
+    with test_database():
+        data = seed_dataset(
+            users=options.users, groups=options.groups,
+            posts=options.posts, comments=options.comments,
+            follows=options.follows,
+        )
+        client = WSGIClient(get_wsgi_application())
+        scenarios = build_scenarios(client, data, random.Random(0))
+        results = {}
+        for name, func in scenarios.items():
+            if options.only and not any(s in name for s in options.only):
+                continue
+            results[name] = run_scenario(
+                func, options.requests, options.warmup
+            )
+
+    print_table(
+        [{'scenario': name, **stats} for name, stats in results.items()],
+        ['scenario', 'p50_ms', 'p95_ms', 'p99_ms', 'rps', 'queries',
+         'errors'],
+    )
+    report = {
+        'dataset': {
+            'users': options.users, 'groups': options.groups,
+            'posts': options.posts, 'comments': options.comments,
+            'follows': options.follows,
+        },
+        'requests': options.requests,
+        'results': results,
+    }
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+    if options.baseline:
+        with open(options.baseline, encoding='utf-8') as baseline:
+            rows = compare(results, json.load(baseline)['results'])
+        print()
+        print_table(rows, ['scenario', 'p50 %', 'p95 %', 'rps %', 'queries'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Конкурентное чтение постов и комментариев: асинхронные эндпоинты
+/api/v1/async/ под ASGI против синхронных вьюсетов под WSGI.
+
+WSGI-сервер моделируется пулом из `concurrency` потоков (поток на
+запрос), ASGI — задачами asyncio в одном потоке, обращающимися
+к приложению напрямую. Для каждого режима считаются rps, задержки,
+пиковое число потоков процесса и пик памяти Python (tracemalloc).
+
+    python -m benchmarks.bench_asgi --concurrency 1 16 64
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from benchmarks.bench_api import WSGIClient
+from benchmarks.seed import seed_dataset
+from benchmarks.utils import (
+    print_table, setup_django, summary, test_database
+)
+
+
+async def asgi_get(application, path, query, token):
+    """Один GET-запрос к ASGI-приложению; возвращает статус."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [
+            (b'host', b'testserver'),
+            (b'authorization', f'Bearer {token}'.encode()),
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    status = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+@contextmanager
+def resources():
+    """Следит за пиком числа потоков и памяти Python внутри блока."""
+    stats = {'threads': threading.active_count()}
+    done = threading.Event()
+
+    def watch():
+        while not done.wait(0.005):
+            stats['threads'] = max(stats['threads'],
+                                   threading.active_count())
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    tracemalloc.start()
+    watcher.start()
+    try:
+        yield stats
+    finally:
+        done.set()
+        watcher.join()
+        stats['peak_mem_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+
+def run_wsgi(client, requests, concurrency, token):
+    def call(request):
+        path, query = request
+        start = time.perf_counter()
+        status, _ = client.request('GET', path, query, token=token)
+        return time.perf_counter() - start, status
+
+    with resources() as stats:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(call, requests))
+        total = time.perf_counter() - started
+    return results, total, stats
+
+
+def run_asgi(application, requests, concurrency, token):
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(request):
+            path, query = request
+            async with semaphore:
+                start = time.perf_counter()
+                status = await asgi_get(
+                    application, path.replace('/v1/', '/v1/async/'),
+                    query, token
+                )
+                return time.perf_counter() - start, status
+
+        return await asyncio.gather(*(call(r) for r in requests))
+
+    with resources() as stats:
+        started = time.perf_counter()
+        results = asyncio.run(main())
+        total = time.perf_counter() - started
+    return results, total, stats
+
+
+def build_requests(data, count, rng):
+    post_ids = data['post_ids']
+    requests = []
+    for _ in range(count):
+        post_id = rng.choice(post_ids)
+        requests.append(rng.choice([
+            ('/api/v1/posts/', f'limit=10&offset={rng.randrange(100)}'),
+            (f'/api/v1/posts/{post_id}/', ''),
+            (f'/api/v1/posts/{post_id}/comments/', ''),
+        ]))
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--comments', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=[1, 16, 64])
+    options = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with test_database():
+        data = seed_dataset(posts=options.posts, comments=options.comments)
+        # Ответы авторизованным пользователям не кэшируются, поэтому
+        # оба режима действительно читают из базы.
+        token = str(AccessToken.for_user(get_user_model().objects.first()))
+        requests = build_requests(data, options.requests, random.Random(0))
+        wsgi = WSGIClient(get_wsgi_application())
+        asgi = get_asgi_application()
+
+        rows = []
+        for concurrency in options.concurrency:
+            for mode, run, app in (('WSGI', run_wsgi, wsgi),
+                                   ('ASGI', run_asgi, asgi)):
+                results, total, stats = run(
+                    app, requests, concurrency, token
+                )
+                timings = [timing for timing, _ in results]
+                rows.append({
+                    'mode': mode,
+                    'concurrency': concurrency,
+                    'rps': len(results) / total,
+                    **summary(timings),
+                    'errors': sum(status >= 400 for _, status in results),
+                    **stats,
+                })
+    print_table(rows, ['mode', 'concurrency', 'rps', 'p50_ms', 'p95_ms',
+                       'errors', 'threads', 'peak_mem_kb'])
+
+
+if __name__ == '__main__':
+    main()
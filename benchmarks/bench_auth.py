@@ -0,0 +1,67 @@
+"""
+Накладные расходы JWT-аутентификации на один запрос: стандартный
+JWTAuthentication, он же с кэшем проверенных токенов и
+StatelessJWTAuthentication без кэша и с ним.
+
+    python -m benchmarks.bench_auth --repeat 5000
+"""
+import argparse
+
+from benchmarks.utils import (
+    measure, print_table, setup_django, summary, test_database
+)
+
+
+def run(options):
+    from django.contrib.auth import get_user_model
+    from django.test import override_settings
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from api.authentication import (
+        CachedJWTAuthentication, StatelessJWTAuthentication, token_cache,
+        user_states
+    )
+
+    user = get_user_model().objects.create_user(username='bench')
+    token = str(AccessToken.for_user(user))
+    request = Request(APIRequestFactory().get(
+        '/api/v1/posts/', HTTP_AUTHORIZATION=f'Bearer {token}'
+    ))
+
+    cases = [
+        ('JWTAuthentication', JWTAuthentication, 10000),
+        ('JWTAuthentication + token cache', CachedJWTAuthentication, 10000),
+        ('stateless, no token cache', StatelessJWTAuthentication, 0),
+        ('stateless + token cache', StatelessJWTAuthentication, 10000),
+    ]
+    rows = []
+    for name, auth_class, max_size in cases:
+        authenticator = auth_class()
+        token_cache.clear()
+        user_states.clear()
+        with override_settings(JWT_TOKEN_CACHE={'MAX_SIZE': max_size}):
+            authenticator.authenticate(request)
+            timings = measure(
+                lambda: authenticator.authenticate(request), options.repeat
+            )
+        rows.append({'case': name, **summary(timings)})
+    print(f"token cache hit rate: {token_cache.stats()['hit_rate']:.3f}")
+    print_table(rows, ['case', 'count', 'mean_ms', 'p50_ms', 'p95_ms',
+                       'p99_ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5000)
+    options = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(options)
+
+
+if __name__ == '__main__':
+    main()
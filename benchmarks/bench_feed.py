@@ -0,0 +1,105 @@
+"""
+Сравнение стратегий ленты: fan-out on write (таблица FeedEntry)
+и fan-out on read (join по Follow).
+
+    python -m benchmarks.bench_feed --users 500 --authors 50 --posts 20
+"""
+import argparse
+import random
+
+from benchmarks.utils import (
+    measure, print_table, setup_django, summary, test_database
+)
+
+
+def seed(users, authors, follows_per_user, posts_per_author):
+    from django.contrib.auth import get_user_model
+    from posts.models import Follow, Post
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'user_{i}') for i in range(users)
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    author_ids = user_ids[:authors]
+    rng = random.Random(0)
+    Follow.objects.bulk_create(
+        (
+            Follow(user_id=user_id, following_id=author_id)
+            for user_id in user_ids
+            for author_id in rng.sample(author_ids, follows_per_user)
+            if author_id != user_id
+        ),
+        batch_size=1000,
+    )
+    Post.objects.bulk_create(
+        (
+            Post(text=f'Пост {n} автора {author_id}', author_id=author_id)
+            for author_id in author_ids
+            for n in range(posts_per_author)
+        ),
+        batch_size=1000,
+    )
+    return user_ids, author_ids
+
+
+def run(options):
+    from django.db import transaction
+    from posts import services
+    from posts.models import FeedEntry, Post
+
+    user_ids, author_ids = seed(
+        options.users, options.authors,
+        options.follows, options.posts
+    )
+    with transaction.atomic():
+        services.fan_out_posts(Post.objects.all())
+    readers = user_ids[options.authors:][:options.readers]
+
+    def read(strategy):
+        def page():
+            for user_id in readers:
+                list(services.feed_posts(user_id, strategy).select_related(
+                    'author').order_by('-pub_date', '-id')[:options.limit])
+        return page
+
+    rows = []
+    for strategy in ('write', 'read'):
+        timings = measure(read(strategy), options.repeat)
+        stats = summary([t / len(readers) for t in timings])
+        rows.append({'case': f'read page ({strategy})', **stats})
+
+    authors = iter(author_ids * options.repeat)
+
+    def write():
+        post = Post.objects.create(text='Новый пост', author_id=next(authors))
+        services.fan_out_post(post)
+
+    rows.append({
+        'case': 'create post + fan-out',
+        **summary(measure(write, options.repeat)),
+    })
+    print(f'feed entries: {FeedEntry.objects.count()}, '
+          f'readers: {len(readers)}')
+    print_table(rows, ['case', 'count', 'mean_ms', 'p50_ms', 'p95_ms',
+                       'p99_ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--authors', type=int, default=50)
+    parser.add_argument('--follows', type=int, default=10)
+    parser.add_argument('--posts', type=int, default=20)
+    parser.add_argument('--readers', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(options)
+
+
+if __name__ == '__main__':
+    main()
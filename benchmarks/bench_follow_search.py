@@ -0,0 +1,112 @@
+"""
+Поиск подписок по имени автора на 100 000 подписок: прежний icontains
+по following__username (join с пользователями) против префиксного
+поиска по индексу (user, following_name) и поиска подстроки по
+триграммному индексу FTS5 и LIKE по нормализованной колонке.
+
+Замеры для «тяжёлого» подписчика (подписан на всех авторов) и для
+обычного; печатаются и планы запросов.
+
+    python -m benchmarks.bench_follow_search --follows 100000
+"""
+import argparse
+import random
+
+from benchmarks.utils import (
+    measure, print_table, setup_django, summary, test_database
+)
+
+
+def seed_follows(users, follows, rng):
+    """Пользователи и подписки; первый пользователь подписан на всех."""
+    from django.contrib.auth import get_user_model
+    from posts.models import Follow, username_key
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        (User(username=f'{rng.choice(["ivan", "anna", "oleg"])}_{i:06d}')
+         for i in range(users)),
+        batch_size=1000,
+    )
+    names = dict(User.objects.values_list('id', 'username'))
+    ids = list(names)
+    heavy = ids[0]
+    pairs = {(heavy, following) for following in ids[1:]}
+    while len(pairs) < follows:
+        user, following = rng.sample(ids, 2)
+        pairs.add((user, following))
+    Follow.objects.bulk_create(
+        (Follow(user_id=user, following_id=following,
+                following_name=username_key(names[following]))
+         for user, following in pairs),
+        batch_size=1000,
+    )
+    light = Follow.objects.exclude(user_id=heavy).values_list(
+        'user_id', flat=True).first()
+    return heavy, light
+
+
+def query_plan(queryset):
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return '; '.join(row[-1] for row in cursor.fetchall())
+
+
+def run(options):
+    from django.db import connection
+    from posts import search
+    from posts.models import Follow, username_key
+
+    rng = random.Random(0)
+    heavy, light = seed_follows(options.users, options.follows, rng)
+    cases = [
+        ('icontains (join)', lambda queryset, term: queryset.filter(
+            following__username__icontains=term)),
+        ('prefix (index)', search.username_prefix),
+        ('contains (LIKE)', lambda queryset, term: queryset.filter(
+            following_name__contains=username_key(term))),
+        ('contains (trigram)', search.username_contains),
+    ]
+    rows = []
+    plans = []
+    for follower, user_id in (('heavy', heavy), ('light', light)):
+        queryset = Follow.objects.filter(user_id=user_id)
+        for name, method in cases:
+            terms = iter([
+                f'{rng.choice(["ann", "iva", "ole"])}_{rng.randrange(100):02d}'
+                for _ in range(options.repeat)
+            ])
+
+            def lookup():
+                return list(method(queryset, next(terms)).values_list(
+                    'following_id', flat=True))
+            rows.append({'follower': follower, 'case': name,
+                         **summary(measure(lookup, options.repeat))})
+            plan = query_plan(method(queryset, 'ann_01'))
+            plans.append((follower, name, plan))
+    print(f'follows: {Follow.objects.count()}, heavy follower: '
+          f'{Follow.objects.filter(user_id=heavy).count()}, trigram: '
+          f'{search.trigram_supported(connection)}')
+    print_table(rows, ['follower', 'case', 'count', 'mean_ms', 'p50_ms',
+                       'p95_ms', 'p99_ms'])
+    for follower, name, plan in plans:
+        print(f'{follower:6} {name:18} {plan}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--follows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=50)
+    options = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(options)
+
+
+if __name__ == '__main__':
+    main()
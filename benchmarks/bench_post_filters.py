@@ -0,0 +1,90 @@
+"""
+Фильтры и сортировки списка постов (PostFilter): первая страница для
+каждого сочетания group, author, pub_date_after/pub_date_before и
+ordering. Печатает время и план запроса; код выхода 1, если какой-то
+запрос с фильтром читает таблицу постов целиком.
+
+    python -m benchmarks.bench_post_filters --posts 100000 --analyze
+"""
+import argparse
+import sys
+
+from benchmarks.utils import (
+    measure, print_table, setup_django, summary, test_database
+)
+
+
+def spread_pub_dates(minutes):
+    """Разносит даты публикации: пост id публикуется через id * minutes."""
+    from django.db import connection
+    from posts.models import Post
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {Post._meta.db_table} SET pub_date = '
+            f"datetime('2023-01-01', '+' || (id * %s) || ' minutes')",
+            [minutes],
+        )
+
+
+def run(options):
+    from django.db import connection
+
+    from api.management.commands.explain_hot_queries import (
+        full_scans, post_filter_queries, query_plan
+    )
+    from benchmarks.seed import seed_dataset
+
+    seed_dataset(posts=options.posts, comments=0, follows=0)
+    spread_pub_dates(options.minutes)
+    if options.analyze:
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    values = {
+        'group': 'group-1',
+        'author': 'bench_1',
+        'pub_date_after': '2023-03-01T00:00:00Z',
+        'pub_date_before': '2023-04-01T00:00:00Z',
+    }
+    rows = []
+    scans = []
+    for params, queryset in post_filter_queries(values):
+        def first_page():
+            list(queryset.values('id', 'pub_date'))
+        name = '&'.join(f'{key}={value}' for key, value in params.items())
+        name = name or '(без параметров)'
+        rows.append({'params': name,
+                     **summary(measure(first_page, options.repeat))})
+        plan = query_plan(queryset)
+        if options.plans:
+            print(f'{name}: {" | ".join(plan)}')
+        filtered = set(params) - {'ordering'}
+        if full_scans(plan, filtered=bool(filtered)):
+            scans.append((name, plan))
+    print(f'posts: {options.posts}, analyze: {options.analyze}')
+    print_table(rows, ['params', 'count', 'mean_ms', 'p50_ms', 'p95_ms',
+                       'p99_ms'])
+    for name, plan in scans:
+        print(f'FULL SCAN {name}: {" | ".join(plan)}')
+    return not scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--minutes', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--analyze', action='store_true',
+                        help='Собрать статистику ANALYZE перед замерами.')
+    parser.add_argument('--plans', action='store_true',
+                        help='Печатать план каждого запроса.')
+    options = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        ok = run(options)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
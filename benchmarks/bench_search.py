@@ -0,0 +1,84 @@
+"""
+Поиск по словам в постах: сканирование таблицы через icontains
+против FTS5 и инвертированного индекса в памяти (posts.search).
+Замеряется первая страница из 10 записей; у индексов — с сортировкой
+по релевантности и фрагментами текста.
+
+    python -m benchmarks.bench_search --posts 50000 --repeat 50
+"""
+import argparse
+import random
+
+from benchmarks.utils import (
+    measure, print_table, setup_django, summary, test_database
+)
+
+VOCABULARY = [f'слово{i}' for i in range(5000)]
+
+
+def seed_posts(count, rng):
+    from django.contrib.auth import get_user_model
+    from posts.models import Post
+
+    author = get_user_model().objects.create_user(username='bench')
+    Post.objects.bulk_create(
+        (Post(text=' '.join(rng.choices(VOCABULARY, k=rng.randint(10, 80))),
+              author=author)
+         for _ in range(count)),
+        batch_size=1000,
+    )
+
+
+def run(options):
+    from django.conf import settings
+    from django.test import override_settings
+    from posts import search
+    from posts.models import Post
+
+    rng = random.Random(0)
+    seed_posts(options.posts, rng)
+    words = rng.sample(VOCABULARY, options.repeat)
+
+    def icontains():
+        word = next(queries)
+        list(Post.objects.filter(text__icontains=word)
+             .order_by('-pub_date', '-id').values('id', 'text')[:10])
+
+    def indexed():
+        word = next(queries)
+        list(search.search(Post.objects.all(), word)
+             .values('id', 'search_rank', 'search_snippet')[:10])
+
+    cases = [
+        ('icontains (scan)', 'auto', icontains),
+        ('FTS5', 'auto', indexed),
+        ('in-memory index', 'memory', indexed),
+    ]
+    rows = []
+    for name, backend, func in cases:
+        search_settings = {**settings.SEARCH, 'BACKEND': backend}
+        with override_settings(SEARCH=search_settings):
+            search.reset()
+            queries = iter(words[:1])
+            func()  # прогрев и построение индекса в памяти
+            queries = iter(words)
+            timings = measure(func, options.repeat)
+        rows.append({'case': name, **summary(timings)})
+    print(f'posts: {options.posts}')
+    print_table(rows, ['case', 'count', 'mean_ms', 'p50_ms', 'p95_ms',
+                       'p99_ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=50)
+    options = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(options)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Процессорное время сериализации списков на 1000 строк: DRF
+ModelSerializer + JSONRenderer против ValuesSerializer (.values())
++ FastJSONRenderer.
+
+Колонка `render_ms` — только сериализация и рендеринг уже выбранных
+строк, `total_ms` — вместе с выборкой из базы.
+
+    python -m benchmarks.bench_serializers --rows 1000 --repeat 20
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.seed import seed_dataset
+from benchmarks.utils import print_table, setup_django, test_database
+
+
+def cpu_ms(func, repeat):
+    """Медиана процессорного времени вызова `func` в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+    return statistics.median(timings) * 1000
+
+
+def run(options):
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api.fast_serializers import values_serializer
+    from api.renderers import FastJSONRenderer
+    from api.serializers import (
+        CommentSerializer, FollowSerializer, GroupSerializer, PostSerializer
+    )
+    from posts.models import Comment, Follow, Group, Post
+
+    context = {'request': Request(APIRequestFactory().get('/'))}
+    cases = [
+        ('posts', PostSerializer, Post.objects.order_by('-pub_date', '-id')),
+        ('comments', CommentSerializer, Comment.objects.order_by('id')),
+        ('groups', GroupSerializer, Group.objects.order_by('id')),
+        ('follows', FollowSerializer, Follow.objects.order_by('id')),
+    ]
+    scale = 1000 / options.rows
+    rows = []
+    for name, serializer_class, queryset in cases:
+        queryset = queryset[:options.rows]
+        fast = values_serializer(serializer_class)
+
+        def drf_fetch():
+            return list(serializer_class.setup_eager_loading(queryset))
+
+        def drf_render(objects):
+            data = serializer_class(objects, many=True, context=context).data
+            return JSONRenderer().render(data)
+
+        def fast_fetch():
+            return list(fast.values(queryset))
+
+        def fast_render(values):
+            return FastJSONRenderer().render(fast.serialize(values, context))
+
+        for path, fetch, render in (('DRF', drf_fetch, drf_render),
+                                    ('fast', fast_fetch, fast_render)):
+            fetched = fetch()
+            rows.append({
+                'case': f'{name} ({path})',
+                'rows': len(fetched),
+                'render_ms': cpu_ms(lambda: render(fetched),
+                                    options.repeat) * scale,
+                'total_ms': cpu_ms(lambda: render(fetch()),
+                                   options.repeat) * scale,
+            })
+    print_table(rows, ['case', 'rows', 'render_ms', 'total_ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        seed_dataset(users=options.rows, groups=options.rows,
+                     posts=options.rows, comments=options.rows,
+                     follows=options.rows)
+        run(options)
+
+
+if __name__ == '__main__':
+    main()
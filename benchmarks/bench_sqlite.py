@@ -0,0 +1,148 @@
+"""
+Пропускная способность конкурирующих писателей на файловой SQLite:
+настройки по умолчанию против профиля yatube_api.settings_production
+(BEGIN IMMEDIATE, WAL, synchronous=NORMAL, busy timeout, mmap и
+cache_size).
+
+Каждый поток повторяет запись PostViewSet.create и CommentViewSet.create:
+пост с раскладкой по лентам и комментарий со счётчиками поста.
+
+    python -m benchmarks.bench_sqlite --threads 1 4 8 --seconds 3
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import print_table, setup_django
+
+DEFAULT_PROFILE = {
+    'engine': 'django.db.backends.sqlite3', 'options': {}, 'pragmas': {},
+}
+
+
+def production_profile():
+    from yatube_api import settings_production
+
+    database = settings_production.DATABASES['default']
+    return {
+        'engine': database['ENGINE'],
+        'options': database['OPTIONS'],
+        'pragmas': settings_production.SQLITE_PRAGMAS,
+    }
+
+
+def use_database(path, profile):
+    """Переключает алиас default на файл `path` с настройками `profile`."""
+    from django.conf import settings
+    from django.db import connections
+
+    connections.close_all()
+    connections.databases['default'].update({
+        'ENGINE': profile['engine'], 'NAME': path,
+        'OPTIONS': profile['options'],
+    })
+    settings.SQLITE_PRAGMAS = profile['pragmas']
+
+
+def seed():
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from posts.models import Follow, Post
+
+    call_command('migrate', verbosity=0)
+    User = get_user_model()
+    author = User.objects.create(username='author')
+    User.objects.bulk_create(
+        User(username=f'reader_{i}') for i in range(20)
+    )
+    Follow.objects.bulk_create(
+        Follow(user=user, following=author)
+        for user in User.objects.exclude(pk=author.pk)
+    )
+    post = Post.objects.create(text='Пост', author=author)
+    return author.pk, post.pk
+
+
+def writer(author_id, post_id, deadline, results):
+    from django.db import OperationalError, connection, transaction
+    from posts import services
+    from posts.models import Comment, Post
+
+    done = locked = 0
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                with transaction.atomic():
+                    post = Post.objects.create(
+                        text='Новый пост', author_id=author_id
+                    )
+                    services.fan_out_post(post)
+                with transaction.atomic():
+                    Comment.objects.create(
+                        text='Комментарий', author_id=author_id,
+                        post_id=post_id
+                    )
+                    services.refresh_comment_counters(pk=post_id)
+                done += 1
+            except OperationalError as error:
+                if 'locked' not in str(error):
+                    raise
+                locked += 1
+    finally:
+        connection.close()
+    results.append((done, locked))
+
+
+def run_case(threads, seconds, author_id, post_id):
+    results = []
+    deadline = time.perf_counter() + seconds
+    workers = [
+        threading.Thread(
+            target=writer, args=(author_id, post_id, deadline, results)
+        )
+        for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    done = sum(result[0] for result in results)
+    locked = sum(result[1] for result in results)
+    return {
+        'threads': threads,
+        'writes_per_s': done / seconds,
+        'locked': locked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--seconds', type=float, default=3)
+    options = parser.parse_args()
+
+    setup_django()
+    from django.db import connections
+
+    profiles = [
+        ('default', DEFAULT_PROFILE),
+        ('production', production_profile()),
+    ]
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, profile in profiles:
+            use_database(os.path.join(directory, f'{name}.sqlite3'), profile)
+            author_id, post_id = seed()
+            for threads in options.threads:
+                rows.append({
+                    'profile': name,
+                    **run_case(threads, options.seconds, author_id, post_id),
+                })
+        connections.close_all()
+    print_table(rows, ['profile', 'threads', 'writes_per_s', 'locked'])
+
+
+if __name__ == '__main__':
+    main()
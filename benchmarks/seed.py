@@ -0,0 +1,60 @@
+import random
+
+
+def seed_dataset(users=200, groups=10, posts=2000, comments=5000,
+                 follows=2000, rng_seed=0):
+    """
+    Заполняет базу синтетическими данными заданного размера
+    и возвращает словарь с id созданных объектов.
+    """
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from posts import services
+    from posts.models import Comment, Follow, Group, Post
+
+    rng = random.Random(rng_seed)
+    User = get_user_model()
+    password = make_password('bench-password')
+    User.objects.bulk_create(
+        (User(username=f'bench_{i}', password=password)
+         for i in range(users)),
+        batch_size=1000,
+    )
+    Group.objects.bulk_create(
+        Group(title=f'Группа {i}', slug=f'group-{i}', description='')
+        for i in range(groups)
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    group_ids = list(Group.objects.values_list('id', flat=True))
+    Post.objects.bulk_create(
+        (Post(text=f'Пост {i} ' + 'текст ' * rng.randint(5, 50),
+              author_id=rng.choice(user_ids),
+              group_id=rng.choice(group_ids + [None]))
+         for i in range(posts)),
+        batch_size=1000,
+    )
+    post_ids = list(Post.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create(
+        (Comment(text=f'Комментарий {i}', author_id=rng.choice(user_ids),
+                 post_id=rng.choice(post_ids))
+         for i in range(comments)),
+        batch_size=1000,
+    )
+    pairs = set()
+    while len(pairs) < min(follows, users * (users - 1)):
+        user_id, following_id = rng.sample(user_ids, 2)
+        pairs.add((user_id, following_id))
+    Follow.objects.bulk_create(
+        (Follow(user_id=user_id, following_id=following_id)
+         for user_id, following_id in pairs),
+        batch_size=1000,
+    )
+    services.rebuild_comment_counters()
+    services.rebuild_follower_counters()
+    services.rebuild_feeds()
+    return {
+        'user_ids': user_ids,
+        'group_ids': group_ids,
+        'post_ids': post_ids,
+        'password': 'bench-password',
+    }
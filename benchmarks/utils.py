@@ -0,0 +1,90 @@
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, 'yatube_api')
+
+
+def setup_django(settings_module='yatube_api.settings'):
+    """Подключает проект так же, как это делает manage.py."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+    from django.conf import settings
+    # Фоновые задачи выполняются сразу после коммита в потоке запроса:
+    # потоки очереди писали бы в тестовую базу параллельно с замерами,
+    # а в базе SQLite в памяти это даёт «database table is locked».
+    settings.TASK_QUEUE = {**settings.TASK_QUEUE, 'MODE': 'eager'}
+
+
+@contextmanager
+def test_database():
+    """Создаёт временную тестовую базу и удаляет её после замеров."""
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment, teardown_test_environment
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat):
+    """Вызывает `func` `repeat` раз и возвращает длительности в секундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(timings, q):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summary(timings):
+    """Сводка по длительностям в миллисекундах."""
+    return {
+        'count': len(timings),
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+    }
+
+
+def print_table(rows, columns):
+    """Печатает список словарей в виде выровненной таблицы."""
+    widths = {
+        column: max(
+            len(column), *(len(format_cell(row[column])) for row in rows)
+        )
+        for column in columns
+    }
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(
+            format_cell(row[column]).ljust(widths[column])
+            for column in columns
+        ))
+
+
+def format_cell(value):
+    if isinstance(value, float):
+        return f'{value:.3f}'
+    return str(value)
@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import caches
+
+from api.authentication import token_cache, user_states
+from api.groups import group_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Каждый тест начинается с пустых кэшей."""
+    for cache in caches.all():
+        cache.clear()
+    user_states.clear()
+    token_cache.clear()
+    group_cache.clear()
+    yield
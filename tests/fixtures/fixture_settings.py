@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budget(settings):
+    """Превышение `query_budget` представления роняет тест."""
+    settings.QUERY_BUDGET = {**settings.QUERY_BUDGET, 'RAISE': True}
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Файлы изображений пишутся во временный каталог теста."""
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    settings.POST_IMAGES = {**settings.POST_IMAGES, 'PREGENERATE': False}
+    return settings.MEDIA_ROOT
+
+
+@pytest.fixture(autouse=True)
+def eager_tasks(settings):
+    """Фоновые задачи выполняются сразу после коммита."""
+    settings.TASK_QUEUE = {**settings.TASK_QUEUE, 'MODE': 'eager'}
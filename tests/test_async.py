@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadViews:
+
+    @pytest.fixture
+    def data(self, post, post_2, another_post, comment_1_post,
+             comment_2_post, group_2):
+        return post
+
+    @pytest.mark.parametrize('path', [
+        'posts/',
+        'posts/?limit=2&offset=1',
+        'posts/?cursor&limit=2',
+        'posts/{post}/',
+        'posts/{post}/comments/',
+        'posts/{post}/comments/{comment}/',
+        'groups/',
+        'groups/{group}/',
+        'posts/999999/',
+        'posts/?cursor=broken',
+    ])
+    def test_same_output_as_viewsets(self, client, data, comment_1_post,
+                                     path):
+        path = path.format(post=data.id, comment=comment_1_post.id,
+                           group=data.group_id)
+        expected = client.get(f'/api/v1/{path}')
+        response = client.get(f'/api/v1/async/{path}')
+        assert response.status_code == expected.status_code
+        assert response.content == expected.content.replace(
+            b'/api/v1/', b'/api/v1/async/'
+        ), (
+            'Проверьте, что асинхронный эндпоинт возвращает тот же JSON, '
+            'что и вьюсет.'
+        )
+
+    def test_read_only(self, user_client):
+        response = user_client.post('/api/v1/async/posts/', data={})
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+    def test_asgi_middleware_chain(self, client, data):
+        expected = client.get('/api/v1/posts/')
+        response = async_to_sync(AsyncClient().get)('/api/v1/async/posts/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.content == expected.content, (
+            'Проверьте, что асинхронные эндпоинты работают в асинхронной '
+            'цепочке middleware.'
+        )
+        assert response['Server-Timing'].startswith('app;dur=')
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import user_states
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStatelessJWTAuthentication:
+
+    follow_url = '/api/v1/follow/'
+
+    def test_no_user_query_when_cached(self, user_client, follow_1):
+        user_client.get(self.follow_url)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'FROM "auth_user" WHERE "auth_user"."id"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что аутентификация по JWT не загружает '
+            'пользователя из базы на каждый запрос.'
+        )
+
+    def test_write_uses_token_user(self, user_client, user):
+        response = user_client.post('/api/v1/posts/', data={'text': 'Пост'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+
+    def test_deactivated_user_rejected(self, user_client, user):
+        user_client.get(self.follow_url)
+        user.is_active = False
+        user.save()
+        response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что заблокированный пользователь теряет доступ '
+            'сразу после сохранения.'
+        )
+
+    def test_state_expires(self, user_client, user, settings):
+        settings.JWT_USER_STATE_CACHE = {'TTL': -1, 'MAX_SIZE': 10}
+        user_client.get(self.follow_url)
+        assert user_states.get(user.id) is None
+
+    def test_obtained_token_has_username(self, client, user):
+        response = client.post(
+            '/api/v1/jwt/create/',
+            data={'username': user.username, 'password': '1234567'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['access'])
+        assert token['username'] == user.username
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenCache:
+
+    follow_url = '/api/v1/follow/'
+    verify_url = '/api/v1/jwt/verify/'
+
+    def test_repeated_token_hits_cache(self, user_client, token):
+        from api.authentication import token_cache
+
+        for _ in range(3):
+            user_client.get(self.follow_url)
+        stats = token_cache.stats()
+        assert stats['misses'] == 1 and stats['hits'] == 2, (
+            'Проверьте, что повторно присланный токен берётся из кэша '
+            'проверенных токенов.'
+        )
+
+    def test_expired_entry_is_revalidated(self, user_client, token,
+                                          monkeypatch):
+        from api import authentication
+
+        user_client.get(self.follow_url)
+        monkeypatch.setattr(authentication.time, 'time', lambda: 2 ** 40)
+        response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.OK
+        assert authentication.token_cache.stats()['misses'] == 2
+
+    def test_verify_endpoint(self, client, token):
+        for _ in range(2):
+            response = client.post(self.verify_url,
+                                   data={'token': token['access']})
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.verify_url,
+                               data={'token': token['access'] + 'x'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_stats_endpoint(self, user_client, user):
+        user.is_staff = True
+        user.save()
+        response = user_client.get('/api/v1/cache/stats/')
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {'responses', 'tokens'}
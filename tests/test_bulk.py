@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import FeedEntry, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostBulkCreate:
+
+    bulk_url = '/api/v1/posts/bulk/'
+
+    def test_bulk_not_auth(self, client):
+        response = client.post(self.bulk_url, data=[{'text': 'Пост'}],
+                               content_type='application/json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_bulk_create(self, user_client, user, group_1, follow_4):
+        data = [
+            {'text': 'Пост 1', 'group': group_1.id},
+            {'text': 'Пост 2'},
+        ]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.bulk_url}` со списком '
+            'корректных постов возвращает ответ со статусом 201.'
+        )
+        created = response.json()
+        assert [item['text'] for item in created] == ['Пост 1', 'Пост 2']
+        assert all(item['author'] == user.username for item in created)
+        assert set(Post.objects.values_list('id', flat=True)) == {
+            item['id'] for item in created
+        }, 'Проверьте, что ответ содержит id созданных постов.'
+        assert FeedEntry.objects.filter(owner=follow_4.user).count() == 2
+
+    def test_bulk_errors_per_item(self, user_client):
+        data = [{'text': 'Пост 1'}, {}, {'text': 'Пост 3', 'group': 100500}]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            'Проверьте, что ошибки валидации возвращаются по позициям '
+            'элементов запроса.'
+        )
+        assert 'text' in errors[1] and 'group' in errors[2]
+        assert not Post.objects.exists(), (
+            'Проверьте, что при ошибках ни один пост не создаётся.'
+        )
+
+    def test_bulk_cap(self, user_client, settings):
+        settings.POSTS_BULK_CREATE_MAX = 2
+        data = [{'text': f'Пост {i}'} for i in range(3)]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not Post.objects.exists()
+
+    def test_bulk_invalidates_cache(self, client, user_client):
+        client.get('/api/v1/posts/')
+        user_client.post(self.bulk_url, data=[{'text': 'Пост'}],
+                         format='json')
+        assert len(client.get('/api/v1/posts/').json()) == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from api.cache import get_stats
+from posts.models import Comment, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    post_list_url = '/api/v1/posts/'
+
+    def test_anonymous_get_is_cached(self, client, post):
+        first = client.get(self.post_list_url)
+        second = client.get(self.post_list_url)
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный GET-запрос отдаётся из кэша.'
+        )
+        assert first.json() == second.json()
+        assert get_stats()['hits'] == 1
+
+    def test_query_params_are_normalized(self, client, post):
+        client.get(f'{self.post_list_url}?limit=1&offset=0')
+        response = client.get(f'{self.post_list_url}?offset=0&limit=1')
+        assert response['X-Cache'] == 'HIT'
+
+    def test_host_and_scheme_in_key(self, client, post, another_post,
+                                    settings):
+        settings.ALLOWED_HOSTS = ['a.example', 'b.example']
+        client.get(self.post_list_url, {'limit': 1}, HTTP_HOST='a.example')
+        for options in ({'HTTP_HOST': 'b.example'},
+                        {'HTTP_HOST': 'a.example', 'secure': True}):
+            response = client.get(self.post_list_url, {'limit': 1},
+                                  **options)
+            assert response['X-Cache'] == 'MISS', (
+                'Проверьте, что ключ кэша учитывает хост и схему: в ответе '
+                'есть абсолютные ссылки.'
+            )
+        assert response.json()['next'].startswith('https://a.example/')
+
+    def test_authenticated_get_is_not_cached(self, user_client, post):
+        user_client.get(self.post_list_url)
+        response = user_client.get(self.post_list_url)
+        assert 'X-Cache' not in response
+
+    @pytest.mark.parametrize('write', ['post', 'comment', 'group'])
+    def test_writes_invalidate(self, client, user, post, group_1, write):
+        url = {
+            'post': self.post_list_url,
+            'comment': f'/api/v1/posts/{post.id}/comments/',
+            'group': '/api/v1/groups/',
+        }[write]
+        before = client.get(url).json()
+        if write == 'post':
+            Post.objects.create(text='Новый пост', author=user)
+        elif write == 'comment':
+            Comment.objects.create(text='Коммент', author=user, post=post)
+        else:
+            Group.objects.create(title='Новая', slug='new')
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что запись модели сбрасывает кэш ответов.'
+        )
+        assert len(response.json()) == len(before) + 1
+
+    def test_group_delete_invalidates_posts(self, client, post, group_1):
+        client.get(self.post_list_url)
+        group_1.delete()
+        response = client.get(self.post_list_url)
+        assert response.json()[0]['group'] is None
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    post_url = '/api/v1/posts/{post_id}/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+
+    def test_post_etag_not_modified(self, user_client, post):
+        url = self.post_url.format(post_id=post.id)
+        response = user_client.get(url)
+        assert 'ETag' in response and 'Last-Modified' in response, (
+            f'Проверьте, что ответ на GET-запрос к `{self.post_url}` '
+            'содержит заголовки `ETag` и `Last-Modified`.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            cached = user_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED
+        assert not any(
+            '"posts_post"."text"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что ответ 304 строится без загрузки и '
+            'сериализации поста.'
+        )
+
+    def test_post_if_modified_since(self, client, post):
+        url = self.post_url.format(post_id=post.id)
+        response = client.get(url)
+        cached = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_post_update_changes_etag(self, user_client, post):
+        url = self.post_url.format(post_id=post.id)
+        etag = user_client.get(url)['ETag']
+        user_client.patch(url, data={'text': 'Новый текст'})
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение поста меняет его `ETag`.'
+        )
+
+    def test_comments_etag_follows_comments(self, user_client, post,
+                                            comment_1_post):
+        url = self.comments_url.format(post_id=post.id)
+        etag = user_client.get(url)['ETag']
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        user_client.post(url, data={'text': 'Новый коммент'})
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет `ETag` списка '
+            'комментариев.'
+        )
+        assert len(response.json()) == 2
+
+    def test_comments_etag_without_worker(self, user_client, post,
+                                          comment_1_post, settings):
+        settings.TASK_QUEUE = {**settings.TASK_QUEUE, 'MODE': 'worker'}
+        url = self.comments_url.format(post_id=post.id)
+        etag = user_client.get(url)['ETag']
+        user_client.post(url, data={'text': 'Новый коммент'})
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` списка комментариев меняется в запросе '
+            'на создание комментария, не дожидаясь фоновой задачи.'
+        )
+        etag = response['ETag']
+        user_client.delete(f'{url}{comment_1_post.id}/')
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_author_rename_changes_etag(self, user_client, user, post,
+                                        comment_1_post):
+        urls = [self.post_url.format(post_id=post.id),
+                self.comments_url.format(post_id=post.id)]
+        etags = [user_client.get(url)['ETag'] for url in urls]
+        user.username = 'RenamedUser'
+        user.save()
+        for url, etag in zip(urls, etags):
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что переименование автора меняет `ETag` '
+                f'ответа `{url}`, в котором есть его имя.'
+            )
+
+    def test_missing_post(self, client):
+        response = client.get(self.post_url.format(post_id=100500))
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
+import pytest
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommentCounters:
+
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    comment_url = '/api/v1/posts/{post_id}/comments/{comment_id}/'
+    post_url = '/api/v1/posts/{post_id}/'
+
+    def test_counters_follow_comments(self, user_client, post):
+        url = self.comments_url.format(post_id=post.id)
+        first = user_client.post(url, data={'text': 'Первый'}).json()
+        second = user_client.post(url, data={'text': 'Второй'}).json()
+
+        data = user_client.get(self.post_url.format(post_id=post.id)).json()
+        assert data['comments_count'] == 2, (
+            'Проверьте, что поле `comments_count` поста увеличивается при '
+            'создании комментария.'
+        )
+        assert data['last_comment_at'] == second['created'], (
+            'Проверьте, что поле `last_comment_at` поста содержит дату '
+            'последнего комментария.'
+        )
+
+        response = user_client.delete(
+            self.comment_url.format(post_id=post.id, comment_id=second['id'])
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        data = user_client.get(self.post_url.format(post_id=post.id)).json()
+        assert data['comments_count'] == 1
+        assert data['last_comment_at'] == first['created'], (
+            'Проверьте, что после удаления комментария `last_comment_at` '
+            'указывает на последний оставшийся комментарий.'
+        )
+
+    def test_counters_are_read_only(self, user_client, post):
+        user_client.patch(
+            self.post_url.format(post_id=post.id),
+            data={'comments_count': 100}
+        )
+        post.refresh_from_db()
+        assert post.comments_count == 0
+
+    def test_rebuild_command(self, client, post, post_2, another_post,
+                             comment_1_post, comment_2_post,
+                             comment_1_another_post):
+        call_command('rebuild_comment_counters', stdout=StringIO())
+        Post.objects.filter(pk=post.pk).update(comments_count=0,
+                                               last_comment_at=None)
+        post.refresh_from_db()
+        another_post.refresh_from_db()
+        url = self.post_url.format(post_id=post.id)
+        client.get(url)
+        out = StringIO()
+        call_command('rebuild_comment_counters', stdout=out)
+
+        assert 'Обновлено постов: 1.' in out.getvalue(), (
+            'Проверьте, что команда обновляет только посты с неверными '
+            'счётчиками.'
+        )
+        modified = post.modified
+        post.refresh_from_db()
+        assert post.comments_count == 2
+        assert post.last_comment_at == Comment.objects.filter(
+            post=post).latest('created').created
+        assert post.modified > modified, (
+            'Проверьте, что исправление счётчиков сдвигает отметку '
+            'изменения поста.'
+        )
+        assert Post.objects.get(pk=another_post.pk).modified == (
+            another_post.modified)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['comments_count'] == 2
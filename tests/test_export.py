@@ -0,0 +1,68 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExport:
+
+    export_url = '/api/v1/export/'
+
+    @pytest.fixture
+    def admin_client(self, user):
+        from rest_framework.test import APIClient
+
+        user.is_staff = True
+        user.save()
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def read(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        body = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_export_not_admin(self, user_client):
+        response = user_client.get(self.export_url)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_export_all(self, admin_client, post, another_post,
+                        comment_1_post, comment_1_another_post):
+        records = self.read(admin_client.get(self.export_url))
+        assert [(r['type'], r['id']) for r in records] == [
+            ('post', post.id), ('post', another_post.id),
+            ('comment', comment_1_post.id),
+            ('comment', comment_1_another_post.id),
+        ], 'Проверьте, что выгрузка содержит посты и комментарии к ним.'
+        assert records[0]['author'] == post.author.username
+        assert records[0]['group'] == post.group.slug
+        assert records[2]['post'] == post.id
+
+    def test_export_filters(self, admin_client, post, another_post,
+                            comment_1_post, comment_1_another_post):
+        url = f'{self.export_url}?author={another_post.author.username}'
+        records = self.read(admin_client.get(url))
+        assert [(r['type'], r['id']) for r in records] == [
+            ('post', another_post.id),
+            ('comment', comment_1_another_post.id),
+        ]
+        url = f'{self.export_url}?group={post.group.slug}&comments=0'
+        records = self.read(admin_client.get(url))
+        assert [r['id'] for r in records] == [post.id]
+        url = f'{self.export_url}?since=2999-01-01'
+        assert self.read(admin_client.get(url)) == []
+
+    def test_export_bad_date(self, admin_client):
+        response = admin_client.get(f'{self.export_url}?since=вчера')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_export_command(self, post, comment_1_post):
+        out = StringIO()
+        call_command('export_posts', stdout=out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r['type'] for r in records] == ['post', 'comment']
@@ -0,0 +1,81 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.fast_serializers import values_serializer
+from api.renderers import FastJSONRenderer
+from api.serializers import (
+    CommentSerializer, FollowSerializer, GroupSerializer, PostSerializer
+)
+from posts import services
+from posts.models import Comment, Follow, Group, Post
+
+
+@pytest.mark.django_db
+class TestValuesSerializer:
+
+    @pytest.fixture
+    def data(self, post, another_post, comment_1_post, comment_2_post,
+             follow_1, follow_2, group_2, user):
+        Post.objects.create(text='Пост с картинкой\u2028', author=user,
+                            image='posts/image.jpg')
+        services.refresh_comment_counters(pk=comment_1_post.post_id)
+
+    @pytest.mark.parametrize('serializer_class, queryset', [
+        (PostSerializer, Post.objects.order_by('id')),
+        (CommentSerializer, Comment.objects.order_by('id')),
+        (GroupSerializer, Group.objects.order_by('id')),
+        (FollowSerializer, Follow.objects.order_by('id')),
+    ])
+    def test_same_output_as_drf(self, data, serializer_class, queryset):
+        context = {'request': Request(APIRequestFactory().get('/'))}
+        fast = values_serializer(serializer_class)
+        rows = fast.serialize(fast.values(queryset.all()), context)
+        expected = serializer_class(
+            queryset.all(), many=True, context=context
+        ).data
+        assert rows == expected
+        assert (FastJSONRenderer().render(rows)
+                == JSONRenderer().render(expected)), (
+            'Проверьте, что быстрый путь выдаёт побайтно тот же JSON.'
+        )
+
+
+def test_renderer_matches_drf():
+    data = {
+        'text': 'Юникод \u2028 \u2029 "кавычки" \n',
+        'lazy': gettext_lazy('Not found.'),
+        'moment': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901,
+                                    tzinfo=datetime.timezone.utc),
+        'amount': Decimal('1.50'),
+        'items': [1, None, True, 2.5],
+        3: 'ключ-число',
+    }
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONRenderer().render(
+        data, 'application/json; indent=2'
+    ) == JSONRenderer().render(data, 'application/json; indent=2')
+
+
+def test_renderer_floats_match_drf():
+    data = {'floats': [1e-06, 1.5e-05, 0.0001, 1e+16, 2.5e+20, -1e-07,
+                       0.1, 123.456, 9990000000000000.0]}
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data), (
+        'Проверьте, что числа с плавающей точкой записываются как в DRF.'
+    )
+
+
+def test_renderer_uses_orjson(monkeypatch):
+    def drf_render(*args, **kwargs):
+        raise AssertionError('Рендерер DRF вызван без запроса отступов.')
+
+    monkeypatch.setattr(JSONRenderer, 'render', drf_render)
+    assert FastJSONRenderer().render({'id': 1}) == b'{"id":1}', (
+        'Проверьте, что FastJSONRenderer рендерит компактный JSON '
+        'через orjson.'
+    )
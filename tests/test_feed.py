@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts import services
+from posts.models import AuthorStats, FeedEntry, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFeedAPI:
+
+    feed_url = '/api/v1/feed/'
+    post_list_url = '/api/v1/posts/'
+
+    def feed_ids(self, client):
+        response = client.get(self.feed_url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.feed_url}` возвращает ответ со статусом 200.'
+        )
+        return [item['id'] for item in response.json()['results']]
+
+    def test_feed_not_auth(self, client):
+        response = client.get(self.feed_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_feed_fan_out_on_write(self, user_client, user, another_user,
+                                   user_2, follow_1):
+        post_client = type(user_client)()
+        post_client.force_authenticate(another_user)
+        response = post_client.post(self.post_list_url, data={'text': 'Новое'})
+        new_id = response.json()['id']
+        Post.objects.create(text='Чужой пост', author=user_2)
+
+        assert FeedEntry.objects.filter(owner=user, post_id=new_id).exists(), (
+            'Проверьте, что новый пост раскладывается в ленты подписчиков.'
+        )
+        assert self.feed_ids(user_client) == [new_id], (
+            f'Проверьте, что `{self.feed_url}` возвращает посты авторов, '
+            'на которых подписан пользователь, от новых к старым.'
+        )
+
+    def test_feed_backfill_on_follow(self, user_client, another_user,
+                                     another_post):
+        user_client.post('/api/v1/follow/',
+                         data={'following': another_user.username})
+        assert self.feed_ids(user_client) == [another_post.id], (
+            'Проверьте, что при подписке посты автора добавляются в ленту.'
+        )
+
+    def test_feed_fan_out_on_read(self, user_client, user, another_user,
+                                  follow_1, another_post, settings):
+        settings.FEED_FANOUT_MAX_FOLLOWERS = 0
+        Post.objects.create(text='Без fan-out', author=another_user)
+        FeedEntry.objects.all().delete()
+
+        assert len(self.feed_ids(user_client)) == 2, (
+            'Проверьте, что подписчики авторов без fan-out on write '
+            'получают ленту через join по подпискам.'
+        )
+
+    def test_feed_prune_on_unfollow(self, user, follow_1, another_post):
+        FeedEntry.objects.create(owner=user, post=another_post)
+        Follow.objects.filter(pk=follow_1.pk).delete()
+        assert not FeedEntry.objects.filter(owner=user).exists(), (
+            'Проверьте, что после отписки посты автора убираются из ленты.'
+        )
+
+    def test_followers_counter(self, user_client, user, user_2, another_user,
+                               follow_1):
+        def followers_count():
+            return AuthorStats.objects.get(author=another_user).followers_count
+
+        assert followers_count() == 1, (
+            'Проверьте, что подписка увеличивает счётчик подписчиков автора.'
+        )
+        Follow.objects.create(user=user_2, following=another_user)
+        assert followers_count() == 2
+        Follow.objects.filter(pk=follow_1.pk).delete()
+        assert followers_count() == 1, (
+            'Проверьте, что отписка уменьшает счётчик подписчиков автора.'
+        )
+        AuthorStats.objects.all().delete()
+        assert services.rebuild_follower_counters() == 1
+        assert followers_count() == 1
+
+    def test_feed_strategy_uses_counter(self, user, another_user, follow_1,
+                                        settings):
+        settings.FEED_FANOUT_MAX_FOLLOWERS = 1
+        assert not services.follows_heavy_authors(user.id)
+        AuthorStats.objects.filter(author=another_user).update(
+            followers_count=2)
+        assert services.follows_heavy_authors(user.id), (
+            'Проверьте, что выбор стратегии ленты читает сохранённый '
+            'счётчик подписчиков, а не считает их в запросе.'
+        )
@@ -1,3 +1,4 @@
+import time
 from http import HTTPStatus
 
 import pytest
@@ -113,3 +114,65 @@ class TestGroupAPI:
             'виде словаря.'
         )
         self.check_group_info(test_data, '/api/v1/groups/{group_id}/')
+
+    def test_group_cache_follows_changes(self, user_client, group_1):
+        user_client.get(self.group_url)
+        group_1.title = 'Новое название'
+        group_1.save()
+        Group.objects.create(title='Группа 3', slug='group_3')
+        data = user_client.get(self.group_url).json()
+        assert [group['title'] for group in data] == [
+            'Новое название', 'Группа 3'
+        ], (
+            'Проверьте, что кэш групп сбрасывается при сохранении группы.'
+        )
+        group_1.delete()
+        response = user_client.get(
+            self.group_detail_url.format(group_id=group_1.id)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что кэш групп сбрасывается при удалении группы.'
+        )
+
+    def test_group_cache_expires(self, user_client, group_1, settings,
+                                 monkeypatch):
+        settings.GROUP_CACHE = {'TTL': 30}
+        now = time.monotonic()
+        monkeypatch.setattr(time, 'monotonic', lambda: now)
+        user_client.get(self.group_url)
+        # Запись другого процесса: сигналы этого процесса её не видят.
+        Group.objects.bulk_create([Group(title='Группа 3', slug='group_3')])
+        assert len(user_client.get(self.group_url).json()) == 1
+        monkeypatch.setattr(time, 'monotonic', lambda: now + 31)
+        assert len(user_client.get(self.group_url).json()) == 2, (
+            'Проверьте, что кэш групп перечитывается по истечении TTL.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGroupPosts:
+
+    url = '/api/v1/groups/{slug}/posts/'
+
+    def test_group_posts(self, client, post, post_2, another_post, group_1):
+        response = client.get(self.url.format(slug=group_1.slug),
+                              {'limit': 1})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [post_2.id], (
+            f'Проверьте, что `{self.url}` возвращает посты группы от новых '
+            'к старым.'
+        )
+        assert data['results'][0]['author'] == post_2.author.username
+        data = client.get(data['next']).json()
+        assert [item['id'] for item in data['results']] == [post.id], (
+            f'Проверьте, что `{self.url}` поддерживает курсорную пагинацию.'
+        )
+        assert data['next'] is None
+
+    def test_unknown_group(self, client, post):
+        response = client.get(self.url.format(slug='missing'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,112 @@
+import io
+from http import HTTPStatus
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image, ImageCms
+
+from posts import images
+from posts.models import Post
+
+
+def make_image(size=(800, 600), image_format='JPEG', exif=True):
+    image = Image.new('RGB', size, 'red')
+    output = io.BytesIO()
+    options = {}
+    if exif:
+        data = Image.Exif()
+        data[0x010F] = 'Камера'
+        data[0x0112] = 6
+        options['exif'] = data.tobytes()
+        options['icc_profile'] = ImageCms.ImageCmsProfile(
+            ImageCms.createProfile('sRGB')).tobytes()
+    image.save(output, image_format, **options)
+    return output.getvalue()
+
+
+def upload(content, name='photo.jpg'):
+    return SimpleUploadedFile(name, content, content_type='image/jpeg')
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostImages:
+
+    post_list_url = '/api/v1/posts/'
+
+    def create(self, client, content):
+        return client.post(
+            self.post_list_url,
+            data={'text': 'Пост с картинкой', 'image': upload(content)},
+            format='multipart'
+        )
+
+    @pytest.mark.parametrize('image_format', ['JPEG', 'PNG'])
+    def test_upload_strips_metadata(self, user_client, image_format):
+        response = self.create(user_client,
+                               make_image(image_format=image_format))
+        assert response.status_code == HTTPStatus.CREATED
+        post = Post.objects.get(pk=response.json()['id'])
+        with default_storage.open(post.image.name) as stored:
+            image = Image.open(stored)
+            assert image.format == image_format
+            assert not image.getexif(), (
+                'Проверьте, что при загрузке из изображения удаляется EXIF.'
+            )
+            assert 'icc_profile' not in image.info, (
+                'Проверьте, что при загрузке из изображения удаляется '
+                'ICC-профиль.'
+            )
+            assert image.size == (600, 800), (
+                'Проверьте, что ориентация из EXIF применяется к пикселям.'
+            )
+        variants = response.json()['image_variants']
+        assert set(variants) == {'small', 'medium', 'large'}
+        assert set(variants['small']) == {'webp', 'jpeg'}
+
+    def test_upload_limits(self, user_client, settings):
+        settings.POST_IMAGES = {**settings.POST_IMAGES, 'MAX_WIDTH': 100}
+        response = self.create(user_client, make_image())
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'image' in response.json()
+
+        settings.POST_IMAGES = {**settings.POST_IMAGES, 'MAX_BYTES': 100}
+        response = self.create(user_client, make_image((50, 50)))
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_variant_created_lazily(self, user_client, client):
+        post_id = self.create(user_client, make_image()).json()['id']
+        name = Post.objects.get(pk=post_id).image.name
+        variant = images.variant_name(name, 'small', 'webp')
+        assert not default_storage.exists(variant)
+
+        response = client.get(f'/api/v1/images/small/webp/{name}')
+        assert response.status_code == HTTPStatus.FOUND
+        assert response['Location'].endswith(variant)
+        with default_storage.open(variant) as stored:
+            image = Image.open(stored)
+            assert image.format == 'WEBP'
+            assert max(image.size) == 320
+
+    @pytest.mark.parametrize('path', [
+        'huge/webp/posts/photo.jpg',
+        'small/gif/posts/photo.jpg',
+        'small/webp/posts/missing.jpg',
+        'small/webp/posts/../settings.py',
+    ])
+    def test_variant_not_found(self, client, path):
+        response = client.get(f'/api/v1/images/{path}')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_variants_pregenerated(self, user_client, settings):
+        settings.POST_IMAGES = {**settings.POST_IMAGES, 'PREGENERATE': True}
+        post_id = self.create(user_client, make_image()).json()['id']
+        name = Post.objects.get(pk=post_id).image.name
+        for size in settings.POST_IMAGES['SIZES']:
+            for image_format in settings.POST_IMAGES['FORMATS']:
+                assert default_storage.exists(
+                    images.variant_name(name, size, image_format)
+                ), (
+                    'Проверьте, что после сохранения поста фоновая задача '
+                    'создаёт все уменьшенные копии.'
+                )
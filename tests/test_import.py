@@ -0,0 +1,108 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from posts.models import AuthorStats, Comment, Follow, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImportNDJSON:
+
+    def run_import(self, tmp_path, records, *args):
+        path = tmp_path / 'data.ndjson'
+        path.write_text(
+            '\n'.join(json.dumps(record) for record in records),
+            encoding='utf-8'
+        )
+        out = StringIO()
+        call_command('import_ndjson', str(path), *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_all_types(self, tmp_path, user):
+        records = [
+            {'type': 'user', 'username': 'writer'},
+            {'type': 'group', 'slug': 'news', 'title': 'Новости'},
+            {'type': 'post', 'id': 10, 'text': 'Пост', 'author': 'writer',
+             'group': 'news', 'pub_date': '2020-01-01T10:00:00Z'},
+            {'type': 'comment', 'post': 10, 'text': 'Коммент',
+             'author': user.username},
+            {'type': 'follow', 'user': user.username, 'following': 'writer'},
+            {'type': 'follow', 'user': user.username, 'following': 'writer'},
+            {'type': 'post', 'text': 'Сирота', 'author': 'nobody'},
+        ]
+        output = self.run_import(tmp_path, records, '--batch-size', '2')
+
+        post = Post.objects.get(text='Пост')
+        assert post.author.username == 'writer'
+        assert post.group == Group.objects.get(slug='news')
+        assert post.pub_date.year == 2020, (
+            'Проверьте, что импорт сохраняет дату публикации из файла.'
+        )
+        assert post.comments_count == 1
+        assert Comment.objects.get().author == user
+        assert Follow.objects.count() == 1, (
+            'Проверьте, что повторные подписки пропускаются '
+            'по ограничению `unique_follow`.'
+        )
+        assert user.feed_entries.filter(post=post).exists()
+        assert 'строк/с' in output
+        assert 'follow: записано 1, пропущено 1' in output
+
+    def test_roundtrip_with_export(self, tmp_path, post, comment_1_post):
+        out = StringIO()
+        call_command('export_posts', stdout=out)
+        exported = [json.loads(line) for line in out.getvalue().splitlines()]
+        Post.objects.all().delete()
+
+        self.run_import(tmp_path, exported)
+        restored = Post.objects.get()
+        assert restored.text == post.text
+        assert restored.pub_date == post.pub_date
+        assert restored.comments.get().text == comment_1_post.text
+
+    def test_file_ids_not_reused(self, tmp_path, post, user):
+        records = [
+            {'type': 'post', 'id': post.id, 'text': 'Импортированный',
+             'author': user.username, 'pub_date': '2020-01-01T10:00:00Z'},
+            {'type': 'comment', 'post': post.id, 'text': 'К импортированному',
+             'author': user.username, 'created': '2020-01-02T10:00:00Z'},
+            {'type': 'comment', 'post': 100500, 'text': 'Без поста',
+             'author': user.username},
+        ]
+        output = self.run_import(tmp_path, records)
+
+        imported = Post.objects.get(text='Импортированный')
+        assert imported.id != post.id, (
+            'Проверьте, что импорт не переиспользует id постов из файла.'
+        )
+        assert imported.pub_date.year == 2020
+        comment = Comment.objects.get()
+        assert comment.post == imported, (
+            'Проверьте, что комментарий привязывается к посту из файла, '
+            'а не к посту с тем же id в базе.'
+        )
+        assert comment.created.day == 2
+        assert Post.objects.get(pk=post.id).text == post.text
+        assert 'post: записано 1, пропущено 0' in output
+        assert 'comment: записано 1, пропущено 1' in output
+
+    def test_failed_import_rebuilds(self, tmp_path, user):
+        path = tmp_path / 'data.ndjson'
+        path.write_text('\n'.join([
+            json.dumps({'type': 'user', 'username': 'writer'}),
+            json.dumps({'type': 'post', 'text': 'Пост', 'author': 'writer'}),
+            json.dumps({'type': 'follow', 'user': user.username,
+                        'following': 'writer'}),
+            '{не json',
+        ]), encoding='utf-8')
+        with pytest.raises(CommandError):
+            call_command('import_ndjson', str(path), '--batch-size', '1')
+
+        writer = Follow.objects.get().following
+        assert AuthorStats.objects.get(author=writer).followers_count == 1, (
+            'Проверьте, что после прерванного импорта пересчитываются '
+            'счётчики по уже записанным пакетам.'
+        )
+        assert user.feed_entries.filter(post__author=writer).exists()
@@ -0,0 +1,194 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostCursorPagination:
+
+    post_list_url = '/api/v1/posts/'
+
+    @pytest.fixture
+    def posts(self, user):
+        return [
+            Post.objects.create(text=f'Пост {i}', author=user)
+            for i in range(5)
+        ]
+
+    def collect(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_cursor_first_page(self, client, posts):
+        response = client.get(f'{self.post_list_url}?cursor&limit=2')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос с параметром `cursor` к '
+            f'`{self.post_list_url}` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert set(data) == {'next', 'previous', 'results'}, (
+            'Проверьте, что курсорная пагинация возвращает поля `next`, '
+            '`previous` и `results` и не считает общее количество записей.'
+        )
+        assert [item['id'] for item in data['results']] == [
+            posts[4].id, posts[3].id
+        ]
+        assert data['previous'] is None
+
+    def test_cursor_walks_all_posts(self, client, posts):
+        ids = self.collect(client, f'{self.post_list_url}?cursor&limit=2')
+        assert ids == [post.id for post in reversed(posts)], (
+            'Проверьте, что курсорная пагинация выдаёт все публикации '
+            'без пропусков и повторов в порядке убывания даты.'
+        )
+
+    def test_cursor_stable_under_inserts(self, client, user, posts):
+        data = client.get(f'{self.post_list_url}?cursor&limit=2').json()
+        Post.objects.create(text='Новый пост', author=user)
+        ids = [item['id'] for item in data['results']]
+        ids += self.collect(client, data['next'])
+        assert ids == [post.id for post in reversed(posts)], (
+            'Проверьте, что новые публикации не сдвигают страницы '
+            'курсорной пагинации.'
+        )
+
+    def test_cursor_follows_ordering(self, client, posts):
+        ids = self.collect(
+            client, f'{self.post_list_url}?cursor&limit=2&ordering=pub_date')
+        assert ids == [post.id for post in posts], (
+            'Проверьте, что курсорная пагинация учитывает параметр '
+            '`ordering`.'
+        )
+        ids = self.collect(
+            client, f'{self.post_list_url}?cursor&limit=2&ordering=-pub_date')
+        assert ids == [post.id for post in reversed(posts)]
+
+    def test_cursor_with_search_rejected(self, client, posts):
+        response = client.get(self.post_list_url,
+                              {'cursor': '', 'search': 'пост'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что курсор вместе с `search` возвращает ошибку 400: '
+            'порядок по релевантности курсором не выражается.'
+        )
+        assert 'cursor' in response.json()
+
+    def test_cursor_previous(self, client, posts):
+        first = client.get(f'{self.post_list_url}?cursor&limit=2').json()
+        second = client.get(first['next']).json()
+        back = client.get(second['previous']).json()
+        assert back['results'] == first['results'], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу.'
+        )
+
+    def test_invalid_cursor(self, client, posts):
+        response = client.get(f'{self.post_list_url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('position', [
+        ['abc', 1],
+        [{'a': 1}, 1],
+        ['2020-01-01T00:00:00+00:00', 'x'],
+        ['2020-01-01T00:00:00', 1],
+        ['2020-13-01T00:00:00+00:00', 1],
+        [None, None],
+        ['2020-01-01T00:00:00+00:00', True],
+    ])
+    def test_invalid_cursor_values(self, client, posts, position):
+        payload = json.dumps({'p': position, 'r': 0}).encode()
+        token = base64.urlsafe_b64encode(payload).decode().rstrip('=')
+        response = client.get(self.post_list_url, {'cursor': token})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что курсор с позицией {position} отклоняется '
+            'ответом 404, а не ошибкой сервера.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestListCaps:
+
+    @pytest.fixture(autouse=True)
+    def small_pages(self, settings):
+        settings.API_PAGINATION = {
+            scope: {'DEFAULT_LIMIT': 2, 'MAX_LIMIT': 3}
+            for scope in ('posts', 'comments', 'groups', 'follow')
+        }
+
+    @pytest.fixture
+    def lists(self, user, post, django_user_model):
+        from posts.models import Comment, Follow, Group
+
+        for i in range(4):
+            author = django_user_model.objects.create_user(
+                username=f'author-{i}'
+            )
+            Follow.objects.create(user=user, following=author)
+            Comment.objects.create(text=f'Коммент {i}', author=user,
+                                   post=post)
+            Group.objects.create(title=f'Группа {i}', slug=f'group-{i}')
+            Post.objects.create(text=f'Пост {i}', author=author)
+        return {
+            'posts': '/api/v1/posts/',
+            'comments': f'/api/v1/posts/{post.id}/comments/',
+            'groups': '/api/v1/groups/',
+            'follow': '/api/v1/follow/',
+        }
+
+    @pytest.mark.parametrize('scope', ['posts', 'comments', 'groups',
+                                       'follow'])
+    def test_default_limit(self, user_client, lists, scope):
+        url = lists[scope]
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert isinstance(data, list) and len(data) == 2, (
+            f'Проверьте, что GET-запрос к `{url}` без параметра `limit` '
+            'возвращает список не длиннее DEFAULT_LIMIT записей.'
+        )
+        assert response['Link'].endswith('>; rel="next"'), (
+            'Проверьте, что ссылка на продолжение списка передаётся '
+            'в заголовке `Link`.'
+        )
+        next_url = response['Link'][1:-len('>; rel="next"')]
+        assert 'limit=2' in next_url and 'offset=2' in next_url
+        page = user_client.get(next_url).json()
+        assert page['results'] and not any(
+            item in data for item in page['results']
+        ), 'Проверьте, что ссылка `Link` ведёт на следующую страницу.'
+
+    @pytest.mark.parametrize('scope', ['posts', 'comments', 'groups',
+                                       'follow'])
+    def test_max_limit(self, user_client, lists, scope):
+        url = lists[scope]
+        data = user_client.get(url, {'limit': 1000}).json()
+        assert len(data['results']) == 3, (
+            f'Проверьте, что `limit` для `{url}` ограничен MAX_LIMIT.'
+        )
+        assert data['next']
+
+    def test_last_page_without_link(self, user_client, lists):
+        response = user_client.get(lists['comments'], {'offset': 2})
+        assert len(response.json()) == 2
+        assert 'Link' not in response
+
+    def test_link_is_cached(self, client, lists):
+        first = client.get(lists['posts'])
+        second = client.get(lists['posts'])
+        assert second['X-Cache'] == 'HIT'
+        assert second['Link'] == first['Link'], (
+            'Проверьте, что заголовок `Link` сохраняется в кэше ответов.'
+        )
+
+    def test_async_link(self, client, lists):
+        response = client.get('/api/v1/async/posts/')
+        assert len(response.json()) == 2
+        assert response['Link'].endswith('>; rel="next"')
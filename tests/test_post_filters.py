@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostFilters:
+
+    url = '/api/v1/posts/'
+
+    @pytest.fixture
+    def posts(self, post, post_2, another_post):
+        for day, item in ((3, post), (1, post_2), (2, another_post)):
+            Post.objects.filter(pk=item.pk).update(
+                pub_date=datetime(2024, 1, day, tzinfo=timezone.utc)
+            )
+        return post, post_2, another_post
+
+    def ids(self, client, **params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с параметрами '
+            f'{params} возвращает ответ со статусом 200.'
+        )
+        return [item['id'] for item in response.json()]
+
+    def test_group(self, client, posts, group_1):
+        post, post_2, another_post = posts
+        assert self.ids(client, group=group_1.slug) == [post_2.id, post.id], (
+            'Проверьте, что параметр `group` отбирает посты группы по её '
+            'slug.'
+        )
+        assert self.ids(client, group='missing') == []
+
+    def test_author(self, client, posts, another_user):
+        assert self.ids(client, author=another_user.username) == [
+            posts[2].id
+        ], (
+            'Проверьте, что параметр `author` отбирает посты по имени '
+            'автора.'
+        )
+
+    def test_pub_date_range(self, client, posts):
+        post, post_2, another_post = posts
+        assert self.ids(client, pub_date_after='2024-01-02T00:00:00Z') == [
+            another_post.id, post.id
+        ], (
+            'Проверьте, что параметр `pub_date_after` отбирает посты, '
+            'опубликованные не раньше указанного момента.'
+        )
+        assert self.ids(client, pub_date_after='2024-01-01T12:00:00Z',
+                        pub_date_before='2024-01-02T12:00:00Z') == [
+            another_post.id
+        ]
+
+    def test_ordering(self, client, posts, user):
+        post, post_2, another_post = posts
+        assert self.ids(client, ordering='-pub_date') == [
+            post.id, another_post.id, post_2.id
+        ]
+        assert self.ids(client, author=user.username,
+                        ordering='pub_date') == [post_2.id, post.id]
+
+    def test_ordering_not_allowed(self, client, posts):
+        assert self.ids(client, ordering='text') == self.ids(client), (
+            'Проверьте, что сортировка по полю не из списка разрешённых '
+            'игнорируется.'
+        )
+
+    def test_invalid_date(self, client, posts):
+        response = client.get(self.url, {'pub_date_after': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,114 @@
+import pytest
+
+from posts.models import Comment, Follow, Group, Post
+from tests.utils import assert_constant_queries, count_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryCount:
+
+    def test_post_list(self, user_client, post, django_user_model):
+        def add_posts(count):
+            start = Post.objects.count()
+            for i in range(start, start + count):
+                author = django_user_model.objects.create_user(
+                    username=f'author_{i}', password='1234567'
+                )
+                Post.objects.create(text=f'Пост {i}', author=author)
+
+        assert_constant_queries(user_client, '/api/v1/posts/', add_posts)
+        assert_constant_queries(
+            user_client, '/api/v1/posts/?limit=100&offset=0', add_posts
+        )
+
+    def test_comment_list(self, user_client, post, comment_1_post,
+                          django_user_model):
+        def add_comments(count):
+            for i in range(count):
+                author = django_user_model.objects.create_user(
+                    username=f'commenter_{i}', password='1234567'
+                )
+                Comment.objects.create(
+                    text=f'Коммент {i}', author=author, post=post
+                )
+
+        assert_constant_queries(
+            user_client, f'/api/v1/posts/{post.id}/comments/', add_comments
+        )
+
+    def test_group_list(self, user_client, group_1):
+        url = '/api/v1/groups/'
+        user_client.get(url)
+        assert count_queries(user_client, url) == 0, (
+            'Проверьте, что список групп отдаётся из кэша групп в памяти '
+            'без запросов к базе.'
+        )
+        for i in range(20):
+            Group.objects.create(title=f'Группа {i}', slug=f'group-{i}')
+        assert count_queries(user_client, url) == 1, (
+            'Проверьте, что после изменения групп кэш перечитывает таблицу '
+            'одним запросом.'
+        )
+        assert count_queries(user_client, url) == 0
+
+    def test_group_posts(self, user_client, post, group_1, django_user_model):
+        def add_posts(count):
+            for i in range(count):
+                author = django_user_model.objects.create_user(
+                    username=f'group-author-{i}'
+                )
+                Post.objects.create(text=f'Пост {i}', author=author,
+                                    group=group_1)
+
+        assert_constant_queries(
+            user_client, f'/api/v1/groups/{group_1.slug}/posts/?limit=50',
+            add_posts
+        )
+
+    def test_follow_list(self, user_client, user, follow_1,
+                         django_user_model):
+        def add_follows(count):
+            for i in range(count):
+                following = django_user_model.objects.create_user(
+                    username=f'following_{i}', password='1234567'
+                )
+                Follow.objects.create(user=user, following=following)
+
+        assert_constant_queries(user_client, '/api/v1/follow/', add_follows)
+
+
+@pytest.mark.django_db
+def test_explain_hot_queries_uses_indexes():
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    out = StringIO()
+    call_command('explain_hot_queries', stdout=out)
+    output = out.getvalue()
+    for index in ('post_pub_date_idx', 'post_author_pub_date_idx',
+                  'post_group_pub_date_idx', 'comment_post_created_idx'):
+        assert index in output, (
+            f'Проверьте, что горячие запросы используют индекс `{index}`.'
+        )
+
+
+@pytest.mark.django_db
+def test_post_filters_use_indexes():
+    from api.management.commands.explain_hot_queries import (
+        POST_FILTER_VALUES, full_scans, post_filter_queries, query_plan
+    )
+
+    Group.objects.create(title='Группа', slug=POST_FILTER_VALUES['group'])
+    for params, queryset in post_filter_queries():
+        plan = query_plan(queryset)
+        assert plan
+        filtered = set(params) - {'ordering'}
+        assert not full_scans(plan, filtered=bool(filtered)), (
+            f'Проверьте, что список постов с параметрами {params} не '
+            f'читает таблицу постов целиком: {plan}'
+        )
+        assert not any('TEMP B-TREE' in line for line in plan), (
+            f'Проверьте, что сортировка списка постов с параметрами '
+            f'{params} берётся из индекса: {plan}'
+        )
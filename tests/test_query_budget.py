@@ -0,0 +1,44 @@
+import pytest
+from django.db import connection
+
+from api.middleware import QueryBudgetExceeded, QueryCounter
+from api.views import PostViewSet
+from posts import queue
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryBudget:
+
+    post_list_url = '/api/v1/posts/'
+
+    def test_server_timing_header(self, client, post):
+        response = client.get(self.post_list_url)
+        assert response['Server-Timing'].startswith('db;dur='), (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` '
+            'со временем запросов к базе.'
+        )
+        assert 'queries' in response['Server-Timing']
+
+    def test_budget_exceeded_fails(self, client, post, monkeypatch):
+        monkeypatch.setattr(PostViewSet, 'query_budget', {'list': 0})
+        with pytest.raises(QueryBudgetExceeded):
+            client.get(self.post_list_url)
+
+    def test_budget_exceeded_logged(self, client, post, monkeypatch,
+                                    settings, caplog):
+        settings.QUERY_BUDGET = {'RAISE': False}
+        monkeypatch.setattr(PostViewSet, 'query_budget', 0)
+        response = client.get(self.post_list_url)
+        assert response.status_code == 200
+        assert 'при бюджете 0' in caplog.text
+
+    def test_eager_tasks_not_counted(self, post):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            queue.run_eager(Post.objects.count, {})
+            Post.objects.count()
+        assert counter.count == 1, (
+            'Проверьте, что запросы задач, выполняемых сразу после '
+            'коммита, не входят в бюджет запроса API.'
+        )
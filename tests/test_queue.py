@@ -0,0 +1,105 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from posts import queue
+from posts.models import FeedEntry, Follow, OutboxTask, Post
+
+calls = []
+
+
+@queue.task
+def record(value, fail_times=0):
+    calls.append(value)
+    if calls.count(value) <= fail_times:
+        raise RuntimeError('сбой')
+
+
+@pytest.fixture
+def worker_mode(settings):
+    calls.clear()
+    settings.TASK_QUEUE = {**settings.TASK_QUEUE, 'MODE': 'worker',
+                           'MAX_ATTEMPTS': 3}
+
+
+def make_due():
+    OutboxTask.objects.update(run_at=timezone.now() - timedelta(seconds=1))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTaskQueue:
+
+    def test_enqueued_in_transaction(self, worker_mode):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                record.delay(value='отменена')
+                raise RuntimeError
+        with transaction.atomic():
+            record.delay(value='ok')
+        assert OutboxTask.objects.count() == 1, (
+            'Проверьте, что задача пишется в outbox в транзакции записи.'
+        )
+        assert queue.run_due() == 1
+        assert calls == ['ok']
+        assert not OutboxTask.objects.exists(), (
+            'Проверьте, что выполненная задача удаляется из outbox.'
+        )
+
+    def test_retries_with_backoff(self, worker_mode):
+        record.delay(value='flaky', fail_times=1)
+        queue.run_due()
+        task = OutboxTask.objects.get()
+        assert task.status == OutboxTask.PENDING
+        assert task.attempts == 1
+        assert task.run_at > timezone.now()
+        assert 'сбой' in task.last_error
+        assert queue.run_due() == 0
+
+        make_due()
+        queue.run_due()
+        assert not OutboxTask.objects.exists()
+        assert calls == ['flaky', 'flaky']
+
+    def test_gives_up_after_max_attempts(self, worker_mode):
+        record.delay(value='broken', fail_times=10)
+        for _ in range(3):
+            make_due()
+            queue.run_due()
+        task = OutboxTask.objects.get()
+        assert task.status == OutboxTask.FAILED
+        assert task.attempts == 3
+
+    def test_expired_lease_is_reclaimed(self, worker_mode):
+        record.delay(value='stuck')
+        OutboxTask.objects.update(status=OutboxTask.RUNNING,
+                                  run_at=timezone.now() + timedelta(hours=1))
+        assert queue.run_due() == 0
+        make_due()
+        assert queue.run_due() == 1
+        assert calls == ['stuck']
+
+    def test_thread_mode(self, worker_mode, settings):
+        settings.TASK_QUEUE = {**settings.TASK_QUEUE, 'MODE': 'thread'}
+        record.delay(value='thread')
+        deadline = time.monotonic() + 5
+        while OutboxTask.objects.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert calls == ['thread'], (
+            'Проверьте, что в режиме thread задача выполняется в пуле '
+            'потоков после коммита.'
+        )
+
+    def test_run_worker_command(self, worker_mode, user, another_user):
+        Follow.objects.create(user=user, following=another_user)
+        post = Post.objects.create(text='Пост', author=another_user)
+        with transaction.atomic():
+            queue.enqueue('posts.tasks.fan_out_posts', post_ids=[post.id])
+        assert not FeedEntry.objects.exists()
+        call_command('run_worker', '--once', '--concurrency', '2')
+        assert FeedEntry.objects.filter(owner=user, post=post).exists(), (
+            'Проверьте, что `run_worker` выполняет задачи из outbox.'
+        )
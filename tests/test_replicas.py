@@ -0,0 +1,105 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+from api.cache import BUMPED_KEY, get_cache
+from api.db_router import ReplicaRouter
+from posts.models import Group, Post
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """
+    Вторая SQLite-база в файле; возвращает функцию, копирующую
+    в неё текущее состояние основной базы.
+    """
+    alias = 'replica'
+    path = tmp_path / 'replica.sqlite3'
+    connections.databases[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path),
+    }
+    settings.DATABASE_REPLICAS = [alias]
+
+    def sync():
+        connections[alias].close()
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+
+    yield sync
+    connections[alias].close()
+    del connections[alias]
+    del connections.databases[alias]
+
+
+def test_router_outside_request():
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    assert router.db_for_write(Post) == DEFAULT_DB_ALIAS
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    post_list_url = '/api/v1/posts/'
+
+    def test_safe_reads_use_replica(self, user_client, user, replica):
+        replica()
+        Post.objects.create(text='Только в основной базе', author=user)
+        response = user_client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [], (
+            'Проверьте, что GET-запросы читают из реплики.'
+        )
+
+    def test_reads_stick_to_primary_after_write(self, user_client, user,
+                                                replica, settings):
+        replica()
+        response = user_client.post(self.post_list_url, data={'text': 'Пост'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert settings.READ_YOUR_WRITES['COOKIE'] in response.cookies
+        response = user_client.get(self.post_list_url)
+        assert len(response.json()) == 1, (
+            'Проверьте, что после записи клиент читает из основной базы.'
+        )
+        user_client.cookies.clear()
+        assert user_client.get(self.post_list_url).json() == []
+
+    def test_failed_write_does_not_pin(self, user_client, replica, settings):
+        replica()
+        response = user_client.post(self.post_list_url, data={})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert settings.READ_YOUR_WRITES['COOKIE'] not in response.cookies
+
+    def test_cache_miss_after_write_reads_primary(self, client, user,
+                                                  replica):
+        replica()
+        Post.objects.create(text='Только в основной базе', author=user)
+        response = client.get(self.post_list_url)
+        assert response['X-Cache'] == 'MISS'
+        assert len(response.json()) == 1, (
+            'Проверьте, что сразу после смены версии кэша промах читает '
+            'из основной базы и не кэширует устаревший ответ реплики.'
+        )
+        assert len(client.get(self.post_list_url).json()) == 1
+
+    def test_cache_miss_reads_replica_after_window(self, client, user,
+                                                   replica):
+        replica()
+        Post.objects.create(text='Только в основной базе', author=user)
+        get_cache().delete(BUMPED_KEY.format('posts'))
+        assert client.get(self.post_list_url).json() == [], (
+            'Проверьте, что вне окна после смены версии анонимные '
+            'запросы читают из реплики.'
+        )
+
+    def test_group_cache_reads_primary(self, user_client, replica):
+        replica()
+        Group.objects.create(title='Новая группа', slug='new')
+        response = user_client.get('/api/v1/groups/')
+        assert [group['slug'] for group in response.json()] == ['new'], (
+            'Проверьте, что кэш групп перечитывается из основной базы.'
+        )
@@ -0,0 +1,228 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from posts import search, services
+from posts.models import Comment, Follow, Post
+
+
+@pytest.fixture(params=['auto', 'memory'])
+def search_backend(request, settings):
+    settings.SEARCH = {**settings.SEARCH, 'BACKEND': request.param}
+    search.reset()
+    yield request.param
+    search.reset()
+
+
+@pytest.fixture
+def posts(user, another_user):
+    return [
+        Post.objects.create(text='Кошка спит на окне.', author=user),
+        Post.objects.create(
+            text='Собака и кошка. Кошка гоняет собаку, кошка довольна.',
+            author=another_user,
+        ),
+        Post.objects.create(text='Про собак и прогулки.', author=user),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSearch:
+
+    post_list_url = '/api/v1/posts/'
+
+    def find(self, client, url, query, **params):
+        response = client.get(url, {'search': query, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `search` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_backend(self, search_backend):
+        assert search.uses_fts(connection) == (search_backend == 'auto'), (
+            'Проверьте, что на SQLite с FTS5 поиск идёт по FTS5.'
+        )
+
+    def test_posts_ranked(self, client, search_backend, posts):
+        data = self.find(client, self.post_list_url, 'КОШКА')
+        assert [item['id'] for item in data] == [posts[1].id, posts[0].id], (
+            'Проверьте, что поиск без учёта регистра находит посты со '
+            'словом и сортирует их по релевантности.'
+        )
+        assert data[0]['rank'] > data[1]['rank'] > 0
+        assert '<b>Кошка</b>' in data[0]['snippet'], (
+            'Проверьте, что фрагмент текста выделяет найденные слова.'
+        )
+        assert data[0]['author'] == posts[1].author.username
+
+    def test_all_words_required(self, client, search_backend, posts):
+        data = self.find(client, self.post_list_url, 'собака кошка')
+        assert [item['id'] for item in data] == [posts[1].id]
+
+    def test_query_syntax_is_not_interpreted(self, client, search_backend,
+                                             posts):
+        for query in ('"кошка', 'кошка OR', 'NEAR(кошка', 'кош*', '—'):
+            data = self.find(client, self.post_list_url, query)
+            assert all('кошка' in item['text'].lower() for item in data)
+        assert self.find(client, self.post_list_url, '!!!') == []
+
+    def test_paginated(self, client, search_backend, posts):
+        data = self.find(client, self.post_list_url, 'кошка', limit=1)
+        assert data['count'] == 2
+        assert [item['id'] for item in data['results']] == [posts[1].id]
+
+    def test_index_follows_changes(self, client, search_backend, posts):
+        self.find(client, self.post_list_url, 'кошка')
+        posts[0].text = 'Попугай спит на окне.'
+        posts[0].save()
+        posts[1].delete()
+        services.bulk_create_posts(posts[2].author_id,
+                                   [{'text': 'Кошка в коробке.'}])
+        data = self.find(client, self.post_list_url, 'кошка')
+        assert [item['text'] for item in data] == ['Кошка в коробке.'], (
+            'Проверьте, что индекс обновляется при сохранении, удалении '
+            'и массовом создании постов.'
+        )
+        data = self.find(client, self.post_list_url, 'попугай')
+        assert [item['id'] for item in data] == [posts[0].id]
+
+    def test_comments_scoped_to_post(self, user_client, user, search_backend,
+                                     posts):
+        for post in posts[:2]:
+            Comment.objects.create(text='Кошка мурчит', author=user,
+                                   post=post)
+        Comment.objects.create(text='Собака лает', author=user,
+                               post=posts[0])
+        url = f'/api/v1/posts/{posts[0].id}/comments/'
+        data = self.find(user_client, url, 'кошка')
+        assert [item['post'] for item in data] == [posts[0].id], (
+            'Проверьте, что поиск по комментариям ищет только в '
+            'комментариях поста.'
+        )
+        assert data[0]['snippet'] == '<b>Кошка</b> мурчит'
+
+    def test_scope_applied_before_limit(self, user_client, user,
+                                        search_backend, posts, settings):
+        settings.SEARCH = {**settings.SEARCH, 'MAX_RESULTS': 2}
+        Comment.objects.bulk_create([
+            Comment(text='Кошка кошка кошка', author=user, post=posts[0])
+            for _ in range(3)
+        ] + [Comment(text='Кошка и собака', author=user, post=posts[1])])
+        search.rebuild()
+        data = self.find(user_client,
+                         f'/api/v1/posts/{posts[1].id}/comments/', 'кошка')
+        assert [item['text'] for item in data] == ['Кошка и собака'], (
+            'Проверьте, что поиск по комментариям поста не теряет '
+            'совпадения из-за ограничения MAX_RESULTS.'
+        )
+        data = self.find(user_client, self.post_list_url, 'собак',
+                         author=user.username)
+        assert [item['id'] for item in data] == [posts[2].id]
+
+    def test_snippet_is_escaped(self, client, user, search_backend):
+        Post.objects.create(
+            text='Кошка <img src=x onerror="alert(1)"> & мышь', author=user
+        )
+        data = self.find(client, self.post_list_url, 'кошка')
+        snippet = data[0]['snippet']
+        assert '<img' not in snippet, (
+            'Проверьте, что текст во фрагменте экранируется для HTML.'
+        )
+        assert snippet.startswith('<b>Кошка</b> &lt;img')
+        assert '&amp; мышь' in snippet
+
+    def test_rank_rendered_as_drf(self, client, user, search_backend):
+        for text in ('Привет, мир.', 'Привет всем.', 'Привет!'):
+            Post.objects.create(text=text, author=user)
+        response = client.get(self.post_list_url, {'search': 'привет'})
+        assert b'e-' in response.content
+        assert response.content == JSONRenderer().render(response.data), (
+            'Проверьте, что ответ поиска побайтно совпадает с выводом '
+            'JSONRenderer.'
+        )
+
+    def test_rebuild_command(self, client, search_backend, posts):
+        call_command('rebuild_search_index', stdout=None)
+        data = self.find(client, self.post_list_url, 'прогулки')
+        assert [item['id'] for item in data] == [posts[2].id]
+
+    def test_without_search(self, client, posts):
+        data = client.get(self.post_list_url).json()
+        assert 'rank' not in data[0] and 'snippet' not in data[0]
+
+
+def test_snippet_window(settings):
+    settings.SEARCH = {**settings.SEARCH, 'SNIPPET_WORDS': 4}
+    text = 'Раз два три четыре пять кошка семь восемь девять.'
+    assert search.make_snippet(text, {'кошка'}) == (
+        '…пять <b>кошка</b> семь восемь…'
+    )
+    assert search.make_snippet('Кошка.', {'кошка'}) == '<b>Кошка</b>.'
+    assert search.make_snippet('<i>кошка</i>', {'кошка'}) == (
+        '&lt;i&gt;<b>кошка</b>&lt;/i&gt;'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFollowNameSearch:
+
+    url = '/api/v1/follow/'
+
+    @pytest.fixture
+    def authors(self, user, django_user_model):
+        authors = [
+            django_user_model.objects.create_user(username=username)
+            for username in ('Alice', 'malice', 'Bob', 'Алиса')
+        ]
+        for author in authors:
+            Follow.objects.create(user=user, following=author)
+        return authors
+
+    def names(self, client, **params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(item['following'] for item in response.json())
+
+    def test_contains(self, user_client, authors):
+        assert self.names(user_client, search='LIC') == ['Alice', 'malice'], (
+            'Проверьте, что поиск подписок по подстроке имени не зависит '
+            'от регистра.'
+        )
+        assert self.names(user_client, search='ob') == ['Bob']
+        assert self.names(user_client, search='АЛИС') == ['Алиса']
+
+    def test_prefix(self, user_client, authors):
+        assert self.names(user_client, search='al', match='prefix') == [
+            'Alice'
+        ], (
+            'Проверьте, что `match=prefix` ищет подписки по началу имени.'
+        )
+        assert self.names(user_client, search='али', match='prefix') == [
+            'Алиса'
+        ]
+
+    def test_rename(self, user_client, authors):
+        authors[2].username = 'Robert'
+        authors[2].save()
+        assert self.names(user_client, search='rob', match='prefix') == [
+            'Robert'
+        ], (
+            'Проверьте, что после переименования автора подписки на него '
+            'находятся по новому имени.'
+        )
+        assert self.names(user_client, search='bob') == []
+
+    def test_invalid_match(self, user_client, authors):
+        response = user_client.get(self.url, {'search': 'a', 'match': 'x'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_trigram_index(self, authors):
+        if not search.trigram_supported(connection):
+            pytest.skip('SQLite без токенизатора trigram')
+        queryset = search.username_contains(Follow.objects.all(), 'alic')
+        assert 'MATCH' in str(queryset.query)
+        assert queryset.count() == 2
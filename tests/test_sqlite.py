@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection, connections, transaction
+
+from api.signals import apply_sqlite_pragmas
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSQLitePragmas:
+
+    def test_pragmas_applied(self, settings):
+        settings.SQLITE_PRAGMAS = {'synchronous': 'NORMAL',
+                                   'cache_size': -4000,
+                                   'busy_timeout': 1234}
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        assert pragma('synchronous') == 1
+        assert pragma('cache_size') == -4000
+        assert pragma('busy_timeout') == 1234
+
+    def test_production_profile(self):
+        from yatube_api import settings_production
+
+        assert settings_production.DATABASES['default']['CONN_MAX_AGE'] > 0
+        assert settings_production.SQLITE_PRAGMAS['journal_mode'] == 'WAL'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_immediate_transactions(tmp_path):
+    alias = 'immediate'
+    connections.databases[alias] = {
+        'ENGINE': 'yatube_api.sqlite_backend',
+        'NAME': str(tmp_path / 'immediate.sqlite3'),
+    }
+    statements = []
+
+    def capture(execute, sql, params, many, context):
+        statements.append(sql)
+        return execute(sql, params, many, context)
+
+    try:
+        with connections[alias].execute_wrapper(capture):
+            with transaction.atomic(using=alias):
+                connections[alias].cursor().execute('SELECT 1')
+        assert statements[0] == 'BEGIN IMMEDIATE', (
+            'Проверьте, что бэкенд yatube_api.sqlite_backend начинает '
+            'транзакции с BEGIN IMMEDIATE.'
+        )
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
@@ -0,0 +1,29 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url):
+    """Возвращает число SQL-запросов, выполненных при GET-запросе к `url`."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'GET-запрос к `{url}` вернул статус {response.status_code}.'
+    )
+    return len(context.captured_queries)
+
+
+def assert_constant_queries(client, url, add_rows, extra=20):
+    """
+    Проверяет, что число запросов к `url` не зависит от размера выдачи:
+    после прогревочного запроса считает запросы, добавляет `extra` строк
+    через `add_rows` и считает ещё раз.
+    """
+    client.get(url)
+    before = count_queries(client, url)
+    add_rows(extra)
+    after = count_queries(client, url)
+    assert before == after, (
+        f'GET-запрос к `{url}` выполняет {before} SQL-запросов до и {after} '
+        f'после добавления {extra} строк. Проверьте, что связанные объекты '
+        'загружаются через `select_related`.'
+    )
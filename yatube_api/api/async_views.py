@@ -0,0 +1,147 @@
+"""
+Асинхронные (ASGI) эндпоинты чтения постов, комментариев и групп.
+
+В Django 3.2 нет асинхронного ORM, поэтому работа с базой —
+проверка прав, выборка и пагинация — выполняется в ограниченном
+пуле потоков, а сериализация и рендеринг остаются в цикле событий.
+Запросы, выбирающие данные, совпадают с запросами вьюсетов, и
+ответы побайтно повторяют JSON синхронных эндпоинтов.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.views import exception_handler
+
+from .mixins import FastListMixin
+from .renderers import FastJSONRenderer
+from .views import CommentViewSet, GroupViewSet, PostViewSet
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Общий пул потоков размером ASYNC_DB_POOL['MAX_WORKERS']."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_DB_POOL['MAX_WORKERS'],
+                thread_name_prefix='api-async-db',
+            )
+    return _executor
+
+
+def run_in_pool(func, *args):
+    """Выполняет синхронную работу с базой в пуле потоков."""
+    def call():
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return sync_to_async(
+        call, thread_sensitive=False, executor=get_executor()
+    )()
+
+
+def fetch(viewset):
+    """Проверяет права и выбирает данные так же, как list/retrieve."""
+    viewset.check_permissions(viewset.request)
+    if viewset.action == 'retrieve':
+        return viewset.get_object(), None
+    queryset = viewset.filter_queryset(viewset.get_queryset())
+    if isinstance(viewset, FastListMixin):
+        queryset = viewset.get_values_serializer().values(queryset)
+    page = viewset.paginate_queryset(queryset)
+    if page is None:
+        return list(queryset), None
+    return page, viewset.paginator
+
+
+def render(data, status=200, headers=None):
+    response = HttpResponse(
+        FastJSONRenderer().render(data),
+        content_type='application/json',
+        status=status,
+    )
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+def error_response(exc, viewset):
+    """Ответ об ошибке в формате обработчика исключений DRF."""
+    response = exception_handler(
+        exc, {'view': viewset, 'request': viewset.request}
+    )
+    if response is None:
+        raise exc
+    headers = {
+        name: value for name, value in response.items()
+        if name.lower() != 'content-type'
+    }
+    return render(response.data, response.status_code, headers)
+
+
+async def serve(viewset_class, action, request, kwargs):
+    """Выполняет действие list или retrieve вьюсета асинхронно."""
+    viewset = viewset_class(
+        action_map={'get': action, 'head': action}, args=(),
+        kwargs=kwargs, format_kwarg=None, headers={},
+    )
+    viewset.request = viewset.initialize_request(request)
+    try:
+        if request.method.lower() not in viewset.action_map:
+            raise MethodNotAllowed(request.method)
+        rows, paginator = await run_in_pool(fetch, viewset)
+    except Exception as exc:
+        return error_response(exc, viewset)
+
+    if action == 'list' and isinstance(viewset, FastListMixin):
+        data = viewset.get_values_serializer().serialize(
+            rows, viewset.get_serializer_context()
+        )
+    else:
+        data = viewset.get_serializer(rows, many=action == 'list').data
+    if paginator is None:
+        return render(data)
+    response = paginator.get_paginated_response(data)
+    headers = {
+        name: value for name, value in response.items()
+        if name.lower() != 'content-type'
+    }
+    return render(response.data, headers=headers)
+
+
+async def post_list(request):
+    return await serve(PostViewSet, 'list', request, {})
+
+
+async def post_detail(request, pk):
+    return await serve(PostViewSet, 'retrieve', request, {'pk': pk})
+
+
+async def comment_list(request, post_id):
+    return await serve(
+        CommentViewSet, 'list', request, {'post_id': post_id}
+    )
+
+
+async def comment_detail(request, post_id, pk):
+    return await serve(
+        CommentViewSet, 'retrieve', request, {'post_id': post_id, 'pk': pk}
+    )
+
+
+async def group_list(request):
+    return await serve(GroupViewSet, 'list', request, {})
+
+
+async def group_detail(request, pk):
+    return await serve(GroupViewSet, 'retrieve', request, {'pk': pk})
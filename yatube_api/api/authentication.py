@@ -0,0 +1,234 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed, InvalidToken, TokenError
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer, TokenVerifySerializer
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+User = get_user_model()
+
+STATE_FIELDS = ('username', 'is_active', 'is_staff', 'is_superuser')
+
+
+class UserStateCache:
+    """
+    Кэш состояния пользователей (активность, права, имя) в памяти
+    процесса. Запись живёт TTL секунд, поэтому блокировка пользователя
+    доходит до всех процессов не позже чем через TTL.
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            item = self._data.get(user_id)
+            if item is None:
+                return None
+            expires, state = item
+            if expires < time.monotonic():
+                del self._data[user_id]
+                return None
+            return state
+
+    def set(self, user_id, state):
+        options = settings.JWT_USER_STATE_CACHE
+        with self._lock:
+            self._data[user_id] = (time.monotonic() + options['TTL'], state)
+            self._data.move_to_end(user_id)
+            while len(self._data) > options['MAX_SIZE']:
+                self._data.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+user_states = UserStateCache()
+
+
+class TokenCache:
+    """
+    LRU-кэш проверенных токенов: sha256 токена -> утверждения.
+    Запись действительна до `exp` токена, после чего токен снова
+    проходит полную проверку подписи (и получает отказ).
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > time.time():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, payload):
+        max_size = settings.JWT_TOKEN_CACHE['MAX_SIZE']
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (payload['exp'], payload)
+            self._data.move_to_end(key)
+            while len(self._data) > max_size:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+token_cache = TokenCache()
+
+
+def validate_token(raw_token, token_class):
+    """
+    Возвращает проверенный токен `token_class`, повторно используя
+    утверждения уже проверенного ранее токена с тем же хэшем.
+    """
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    key = (token_class.__name__, hashlib.sha256(raw_token).digest())
+    payload = token_cache.get(key)
+    if payload is None:
+        token = token_class(raw_token)
+        token_cache.set(key, token.payload)
+        return token
+    token = token_class.__new__(token_class)
+    token.token = raw_token
+    token.current_time = aware_utcnow()
+    token.payload = dict(payload)
+    return token
+
+
+class StatelessUser(TokenUser):
+    """
+    Пользователь, собранный из утверждений токена и кэша состояния.
+    Модель User из базы не загружается: представления работают с id.
+    """
+
+    def __init__(self, token, state):
+        super().__init__(token)
+        self.state = state
+
+    @cached_property
+    def username(self):
+        return self.token.get('username') or self.state['username']
+
+    @cached_property
+    def is_active(self):
+        return self.state['is_active']
+
+    @cached_property
+    def is_staff(self):
+        return self.state['is_staff']
+
+    @cached_property
+    def is_superuser(self):
+        return self.state['is_superuser']
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, не проверяющий заново подпись повторно
+    присланного токена: утверждения берутся из кэша до `exp`.
+    """
+
+    def get_validated_token(self, raw_token):
+        messages = []
+        for token_class in api_settings.AUTH_TOKEN_CLASSES:
+            try:
+                return validate_token(raw_token, token_class)
+            except TokenError as error:
+                messages.append({'token_class': token_class.__name__,
+                                 'token_type': token_class.token_type,
+                                 'message': error.args[0]})
+        raise InvalidToken({
+            'detail': 'Given token not valid for any token type',
+            'messages': messages,
+        })
+
+
+class StatelessJWTAuthentication(CachedJWTAuthentication):
+    """
+    JWT-аутентификация без SELECT пользователя на каждый запрос:
+    состояние пользователя берётся из кэша с TTL.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+
+        state = user_states.get(user_id)
+        if state is None:
+            state = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values(*STATE_FIELDS).first()
+            if state is None:
+                raise AuthenticationFailed('User not found',
+                                           code='user_not_found')
+            user_states.set(user_id, state)
+
+        if not state['is_active']:
+            raise AuthenticationFailed('User is inactive',
+                                       code='user_inactive')
+        return StatelessUser(validated_token, state)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Добавляет в токены имя пользователя."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.get_username()
+        return token
+
+
+class CachedTokenVerifySerializer(TokenVerifySerializer):
+    """Проверка токена для /jwt/verify/ через кэш проверенных токенов."""
+
+    def validate(self, attrs):
+        validate_token(attrs['token'], UntypedToken)
+        return {}
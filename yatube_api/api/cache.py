@@ -0,0 +1,154 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from .db_router import primary_reads
+
+VERSION_KEY = 'api:version:{}'
+STATS_KEY = 'api:stats:{}'
+# Есть, пока версия пространства сменилась меньше READ_YOUR_WRITES['WINDOW']
+# секунд назад и реплики могут ещё не видеть изменившие её записи.
+BUMPED_KEY = 'api:bumped:{}'
+# Заголовки, которые сохраняются в кэше вместе с данными ответа.
+CACHED_HEADERS = ('Link',)
+
+
+def get_cache():
+    return caches[settings.API_RESPONSE_CACHE['ALIAS']]
+
+
+def _new_version():
+    # Версия на основе времени: если ключ версии вытеснен из кэша,
+    # новая версия не совпадёт ни с одной из выданных ранее.
+    return time.time_ns()
+
+
+def get_version(namespace):
+    cache = get_cache()
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if cache.add(key, version, timeout=None):
+            # Прежняя версия потеряна вместе с отметкой её смены.
+            _mark_bumped(cache, namespace)
+        else:
+            version = cache.get(key, version)
+    return version
+
+
+def _mark_bumped(cache, namespace):
+    cache.set(BUMPED_KEY.format(namespace), True,
+              timeout=settings.READ_YOUR_WRITES['WINDOW'])
+
+
+def recently_bumped(namespace):
+    """Сменилась ли версия пространства в пределах окна отставания реплик."""
+    return get_cache().get(BUMPED_KEY.format(namespace), False)
+
+
+def bump_version(*namespaces):
+    """Инвалидирует все закэшированные ответы указанных пространств."""
+    cache = get_cache()
+    for namespace in namespaces:
+        key = VERSION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=None)
+        _mark_bumped(cache, namespace)
+
+
+def bump_version_on_commit(*namespaces):
+    """
+    Сбрасывает кэш после фиксации текущей транзакции, чтобы читатель
+    не успел сохранить под новой версией ещё не записанные данные.
+    """
+    transaction.on_commit(lambda: bump_version(*namespaces))
+
+
+def make_key(namespace, request):
+    """
+    Ключ ответа: схема, хост, путь, отсортированные параметры запроса
+    и версия. Схема и хост входят в абсолютные ссылки ответа.
+    """
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    raw = (f'{request.scheme}://{request.get_host()}{request.path}'
+           f'?{params!r}:{request.accepted_media_type}')
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    # v2: значение — пара (данные, заголовки CACHED_HEADERS).
+    return f'api:response:v2:{namespace}:{get_version(namespace)}:{digest}'
+
+
+def _record(kind):
+    cache = get_cache()
+    key = STATS_KEY.format(kind)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats():
+    """Счётчики попаданий и промахов кэша ответов."""
+    cache = get_cache()
+    hits = cache.get(STATS_KEY.format('hits'), 0)
+    misses = cache.get(STATS_KEY.format('misses'), 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    get_cache().delete_many(
+        [STATS_KEY.format('hits'), STATS_KEY.format('misses')]
+    )
+
+
+def cached_response(namespace, request, handler):
+    """
+    Возвращает закэшированный ответ на анонимный GET-запрос
+    или вызывает `handler` и сохраняет успешный ответ.
+
+    Сразу после смены версии промах читает из основной базы: ответ
+    сохраняется под новой версией, а реплика может ещё отдавать
+    данные до изменения.
+    """
+    if request.method != 'GET' or request.user.is_authenticated:
+        return handler()
+    cache = get_cache()
+    key = make_key(namespace, request)
+    cached = cache.get(key)
+    if cached is not None:
+        _record('hits')
+        data, headers = cached
+        response = Response(data, headers=headers)
+        response['X-Cache'] = 'HIT'
+        return response
+    _record('misses')
+    if recently_bumped(namespace):
+        with primary_reads():
+            response = handler()
+    else:
+        response = handler()
+    if response.status_code == 200:
+        headers = {
+            name: response[name] for name in CACHED_HEADERS
+            if response.has_header(name)
+        }
+        cache.set(key, (response.data, headers),
+                  settings.API_RESPONSE_CACHE['TIMEOUT'])
+    response['X-Cache'] = 'MISS'
+    return response
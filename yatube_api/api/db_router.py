@@ -0,0 +1,54 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Алиас базы для чтения в текущем запросе; вне запросов (команды,
+# миграции, тесты) не задан, и всё идёт в основную базу.
+read_alias = ContextVar('read_alias', default=None)
+# Выполнял ли текущий запрос запись.
+wrote = ContextVar('wrote', default=False)
+
+
+def choose_replica():
+    """Случайная реплика из DATABASE_REPLICAS или основная база."""
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def primary_reads():
+    """Чтение внутри блока идёт в основную базу."""
+    token = read_alias.set(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Направляет чтение в реплику, закреплённую за запросом
+    ReplicaRoutingMiddleware, а запись — в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Схема реплик приходит с основной базы.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
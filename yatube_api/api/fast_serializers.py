@@ -0,0 +1,132 @@
+"""
+Быстрый путь сериализации списков.
+
+Карта полей собирается один раз из DRF-сериализатора: для каждого
+поля — колонка для `.values()` и функция преобразования значения,
+повторяющая `to_representation` соответствующего поля DRF. Списки
+строятся из словарей `.values()` без создания моделей и без обхода
+полей сериализатора на каждую строку.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import fields, relations
+from rest_framework.settings import api_settings
+
+from .serializers import ImageVariantsField
+
+
+def datetime_converter(field, context):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != fields.ISO_8601:
+        return field.to_representation
+    field_timezone = getattr(field, 'timezone', field.default_timezone())
+
+    def convert(value):
+        if not value:
+            return None
+        if field_timezone is not None:
+            value = value.astimezone(field_timezone)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def file_converter(field, context):
+    if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+        return lambda value: value or None
+    request = context.get('request')
+    storage = getattr(field.parent.Meta.model, field.source).field.storage
+
+    def convert(value):
+        if not value:
+            return None
+        url = storage.url(value)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    return convert
+
+
+def image_variants_converter(field, context):
+    request = context.get('request')
+    return lambda value: field.variant_urls(value, request)
+
+
+def passthrough(field, context):
+    return None
+
+
+# Тип поля DRF -> (колонка для .values(), фабрика преобразования).
+# Фабрика получает поле и контекст и возвращает функцию значения
+# или None, если значение из базы выводится как есть.
+CONVERTERS = (
+    (ImageVariantsField, lambda field: field.source,
+     image_variants_converter),
+    (relations.SlugRelatedField,
+     lambda field: f'{field.source}__{field.slug_field}', passthrough),
+    (relations.PrimaryKeyRelatedField,
+     lambda field: field.source, passthrough),
+    (fields.DateTimeField, lambda field: field.source, datetime_converter),
+    (fields.FileField, lambda field: field.source, file_converter),
+    (fields.IntegerField, lambda field: field.source, passthrough),
+    (fields.FloatField, lambda field: field.source, passthrough),
+    (fields.BooleanField, lambda field: field.source, passthrough),
+    (fields.CharField, lambda field: field.source, passthrough),
+)
+
+
+class ValuesSerializer:
+    """
+    Read-only сериализатор строк `.values()` с выводом, совпадающим
+    с выводом `serializer_class`.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.fields = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            self.fields.append((name, field) + self.compile(name, field))
+        self.columns = tuple(column for _, _, column, _ in self.fields)
+
+    @staticmethod
+    def compile(name, field):
+        for field_class, column, factory in CONVERTERS:
+            if isinstance(field, field_class):
+                return column(field), factory
+        raise ImproperlyConfigured(
+            f'Поле {name} ({type(field).__name__}) не поддерживается '
+            f'быстрой сериализацией.'
+        )
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def serialize(self, rows, context=None):
+        context = context or {}
+        plan = [
+            (name, column, factory(field, context))
+            for name, field, column, factory in self.fields
+        ]
+        if all(convert is None for _, _, convert in plan):
+            return [
+                {name: row[column] for name, column, _ in plan}
+                for row in rows
+            ]
+        return [
+            {
+                name: row[column] if convert is None else convert(row[column])
+                for name, column, convert in plan
+            }
+            for row in rows
+        ]
+
+
+@lru_cache(maxsize=None)
+def values_serializer(serializer_class):
+    """Скомпилированный ValuesSerializer для класса сериализатора."""
+    return ValuesSerializer(serializer_class)
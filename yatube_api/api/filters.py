@@ -1,12 +1,105 @@
 import django_filters
+from django.db.models import Subquery
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
-from posts.models import Follow
+from .groups import group_cache
+from posts import search
+from posts.models import Follow, Post, User
 
 
 class FollowFilter(django_filters.FilterSet):
-    search = django_filters.CharFilter(field_name='following__username',
-                                       lookup_expr='icontains')
+    """
+    Поиск подписок по имени автора без учёта регистра: `match=contains`
+    (по умолчанию) — по подстроке, `match=prefix` — по началу имени.
+    """
+    CONTAINS = 'contains'
+    PREFIX = 'prefix'
+
+    search = django_filters.CharFilter(method='filter_search')
+    match = django_filters.ChoiceFilter(
+        choices=[(CONTAINS, 'Подстрока'), (PREFIX, 'Начало имени')],
+        method='filter_match',
+    )
 
     class Meta:
         model = Follow
-        fields = ['search']
+        fields = ['search', 'match']
+
+    def filter_search(self, queryset, name, value):
+        if self.form.cleaned_data.get('match') == self.PREFIX:
+            return search.username_prefix(queryset, value)
+        return search.username_contains(queryset, value)
+
+    def filter_match(self, queryset, name, value):
+        # Режим учитывается в filter_search.
+        return queryset
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск `?search=` по индексу posts.search: записи со
+    всеми словами запроса по убыванию релевантности.
+    """
+    search_param = 'search'
+
+    @classmethod
+    def get_search_query(cls, request):
+        return request.query_params.get(cls.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if not query:
+            return queryset
+        return search.search(queryset, query)
+
+
+class PostFilter(django_filters.FilterSet):
+    """
+    Фильтры списка постов: `group` (slug), `author` (username),
+    `pub_date_after`/`pub_date_before` (ISO 8601, включительно).
+
+    Группа и автор сравниваются по id, а не через join: id группы
+    берётся из group_cache, id автора — из подзапроса по username.
+    Выборка идёт по индексам (group, -pub_date, -id) и
+    (author, -pub_date, -id).
+    """
+    group = django_filters.CharFilter(method='filter_group')
+    author = django_filters.CharFilter(method='filter_author')
+    pub_date = django_filters.IsoDateTimeFromToRangeFilter()
+
+    class Meta:
+        model = Post
+        fields = ['group', 'author', 'pub_date']
+
+    def filter_group(self, queryset, name, value):
+        group = group_cache.get_by_slug(value)
+        if group is None:
+            return queryset.none()
+        return queryset.filter(group_id=group.id)
+
+    def filter_author(self, queryset, name, value):
+        return queryset.filter(author_id=Subquery(
+            User.objects.filter(username=value).values('id')[:1]
+        ))
+
+
+class IndexedOrderingFilter(OrderingFilter):
+    """
+    Сортировка `?ordering=` только по полям из `ordering_fields`
+    вьюсета с id последним ключом в том же направлении, чтобы порядок
+    был однозначным и совпадал с индексами (..., -pub_date, -id).
+    Без явного параметра не меняет порядок результатов поиска.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if (self.ordering_param not in request.query_params
+                and FullTextSearchFilter.get_search_query(request)):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and ordering[-1].lstrip('-') not in ('id', 'pk'):
+            direction = '-' if ordering[-1].startswith('-') else ''
+            ordering = [*ordering, f'{direction}id']
+        return ordering
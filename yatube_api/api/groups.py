@@ -0,0 +1,72 @@
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import get_version
+from .db_router import primary_reads
+from posts.models import Group
+
+
+class GroupCache:
+    """
+    Вся таблица Group в памяти процесса: группы по id и по slug.
+
+    Таблица маленькая и меняется редко, поэтому читается целиком одним
+    запросом из основной базы. Набор перечитывается после clear()
+    (сигналы сохранения и удаления групп в этом процессе), после смены
+    версии `groups` кэша ответов (её видят все процессы при общем кэше)
+    и не реже чем раз в GROUP_CACHE['TTL'] секунд — так изменения из
+    других процессов доходят и при кэше в памяти процесса.
+
+    Возвращаемые объекты общие для всех потоков: только для чтения.
+    """
+    namespace = 'groups'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._expires = 0
+        self._by_id = None
+        self._by_slug = None
+
+    def _load(self):
+        version = get_version(self.namespace)
+        with self._lock:
+            now = time.monotonic()
+            if (self._by_id is None or self._version != version
+                    or self._expires < now):
+                # Реплика может отставать от записи, сдвинувшей версию.
+                with primary_reads():
+                    groups = list(Group.objects.order_by('id'))
+                self._by_id = {group.id: group for group in groups}
+                self._by_slug = {group.slug: group for group in groups}
+                self._version = version
+                self._expires = now + settings.GROUP_CACHE['TTL']
+            return self._by_id, self._by_slug
+
+    def all(self):
+        """Все группы по возрастанию id."""
+        by_id, _ = self._load()
+        return list(by_id.values())
+
+    def get(self, pk):
+        """Группа по id или None."""
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        by_id, _ = self._load()
+        return by_id.get(pk)
+
+    def get_by_slug(self, slug):
+        """Группа по slug или None."""
+        _, by_slug = self._load()
+        return by_slug.get(slug)
+
+    def clear(self):
+        with self._lock:
+            self._by_id = self._by_slug = None
+
+
+group_cache = GroupCache()
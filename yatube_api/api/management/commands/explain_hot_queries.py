@@ -0,0 +1,128 @@
+from itertools import combinations
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.views import (
+    CommentViewSet, FeedViewSet, FollowViewSet, PostViewSet
+)
+from posts.models import Group, Post
+
+User = get_user_model()
+
+# Значения фильтров PostFilter по умолчанию. На план запроса они не
+# влияют, но группа должна существовать: иначе запрос заведомо пуст.
+POST_FILTER_VALUES = {
+    'group': 'group-1',
+    'author': 'author',
+    'pub_date_after': '2024-01-01T00:00:00Z',
+    'pub_date_before': '2025-01-01T00:00:00Z',
+}
+POST_ORDERINGS = (None, 'pub_date', '-pub_date')
+
+
+def viewset_queryset(viewset_class, action, kwargs=None, params=None):
+    """Queryset, который вьюсет строит для запроса с параметрами `params`."""
+    view = viewset_class(action=action, kwargs=kwargs or {},
+                         format_kwarg=None)
+    request = Request(APIRequestFactory().get('/', params or {}))
+    request.user = User(id=1, username='explain')
+    view.request = request
+    return view.filter_queryset(view.get_queryset())
+
+
+def hot_queries():
+    """Пары (название, queryset) для списков и деталей каждого вьюсета."""
+    now = timezone.now()
+    posts = viewset_queryset(PostViewSet, 'list')
+    comments = viewset_queryset(CommentViewSet, 'list', {'post_id': 1})
+    follows = viewset_queryset(FollowViewSet, 'list')
+    feed = viewset_queryset(FeedViewSet, 'list')
+    return [
+        ('posts: list limit/offset', posts[1000:1010]),
+        ('posts: list cursor',
+         posts.order_by('-pub_date', '-id').filter(pub_date__lt=now)[:11]),
+        ('posts: by author', posts.filter(author_id=1).order_by(
+            '-pub_date')[:10]),
+        ('posts: by group, /groups/{slug}/posts/', posts.filter(
+            group_id=1).order_by('-pub_date', '-id')[:11]),
+        ('posts: detail', posts.filter(pk=1)),
+        ('comments: list', comments),
+        ('comments: detail', comments.filter(pk=1)),
+        ('groups: cache load', Group.objects.order_by('id')),
+        ('follow: list', follows),
+        ('follow: search', viewset_queryset(
+            FollowViewSet, 'list', params={'search': 'user'})),
+        ('feed: list', feed.order_by('-pub_date', '-id')[:11]),
+    ]
+
+
+def post_filter_queries(values=POST_FILTER_VALUES):
+    """
+    Пары (параметры запроса, queryset первой страницы) для всех
+    сочетаний фильтров и сортировок списка постов.
+    """
+    for size in range(len(values) + 1):
+        for names in combinations(values, size):
+            for ordering in POST_ORDERINGS:
+                params = {name: values[name] for name in names}
+                if ordering:
+                    params['ordering'] = ordering
+                queryset = viewset_queryset(PostViewSet, 'list',
+                                            params=params)
+                yield params, queryset[:10]
+
+
+def query_plan(queryset):
+    """
+    Строки плана запроса (EXPLAIN QUERY PLAN для SQLite); пустой
+    список, если запрос заведомо пуст и в базу не отправляется,
+    например для несуществующей группы.
+    """
+    if queryset.query.is_empty():
+        return []
+    return queryset.explain().splitlines()
+
+
+def full_scans(plan, filtered=True):
+    """
+    Строки плана, читающие таблицу постов целиком. Без фильтров
+    допустим просмотр индекса в порядке сортировки: его останавливает
+    LIMIT.
+    """
+    table = Post._meta.db_table
+    return [
+        line for line in plan
+        if f'SCAN {table}' in line
+        and (filtered or 'USING' not in line)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Печатает планы выполнения основных запросов API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sql', action='store_true',
+                            help='Печатать также текст SQL-запроса.')
+        parser.add_argument('--post-filters', action='store_true',
+                            help='Все сочетания фильтров и сортировок '
+                                 'списка постов.')
+
+    def handle(self, *args, **options):
+        queries = hot_queries()
+        if options['post_filters']:
+            queries += [
+                (f'posts: {urlencode(params) or "list"}', queryset)
+                for params, queryset in post_filter_queries()
+            ]
+        for name, queryset in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            if options['sql']:
+                self.stdout.write(str(queryset.query))
+            self.stdout.write(
+                '\n'.join(query_plan(queryset)) or 'Пустой запрос.')
+            self.stdout.write('')
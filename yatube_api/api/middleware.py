@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from . import db_router
+from posts import queue
+
+logger = logging.getLogger('api.query_budget')
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше SQL-запросов, чем объявлено."""
+
+
+class QueryCounter:
+    """
+    execute_wrapper, считающий запросы и время в базе. Запросы задач,
+    выполняемых сразу после коммита (TASK_QUEUE['MODE'] = 'eager'),
+    не считаются: в остальных режимах они идут вне запроса.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        if queue.running_task.get():
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def get_query_budget(view_func, method):
+    """
+    Бюджет из атрибута `query_budget` класса представления:
+    число или словарь {действие вьюсета: число}.
+    """
+    view_class = getattr(view_func, 'cls', None) or getattr(
+        view_func, 'view_class', None)
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        actions = getattr(view_func, 'actions', None) or {}
+        return budget.get(actions.get(method.lower(), method.lower()))
+    return budget
+
+
+class AsyncCapableMiddleware:
+    """
+    Основа middleware, работающего и в синхронной, и в асинхронной
+    цепочке: под ASGI запрос не занимает поток на всё время обработки.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        raise NotImplementedError
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    """
+    Считает SQL-запросы и время в базе на каждый запрос, добавляет
+    заголовок Server-Timing и сообщает о превышении бюджета
+    представления: пишет в лог, а при QUERY_BUDGET['RAISE'] падает.
+
+    В асинхронной цепочке запросы к базе идут из общих потоков пула
+    и не относятся к конкретному запросу, поэтому считается только
+    общее время.
+    """
+
+    def handle(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        response['Server-Timing'] = (
+            f'db;dur={counter.duration * 1000:.2f};'
+            f'desc="{counter.count} queries", '
+            f'app;dur={total * 1000:.2f}'
+        )
+        budget = getattr(request, 'query_budget', None)
+        if (budget is not None and counter.count > budget
+                and not response.streaming):
+            self.report(request, counter, budget)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        total = time.perf_counter() - start
+        response['Server-Timing'] = f'app;dur={total * 1000:.2f}'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
+
+    def report(self, request, counter, budget):
+        message = (
+            f'{request.method} {request.path}: {counter.count} SQL-запросов '
+            f'при бюджете {budget}'
+        )
+        if settings.QUERY_BUDGET['RAISE']:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """
+    Закрепляет чтение безопасных запросов за одной репликой.
+
+    Клиент, выполнивший запись, получает cookie, и его запросы
+    READ_YOUR_WRITES['WINDOW'] секунд читают из основной базы, чтобы
+    видеть свои изменения несмотря на отставание реплик.
+    """
+
+    def handle(self, request):
+        tokens = self.route(request)
+        try:
+            response = self.get_response(request)
+            if db_router.wrote.get():
+                self.pin(response)
+        finally:
+            self.reset(tokens)
+        return response
+
+    async def __acall__(self, request):
+        tokens = self.route(request)
+        try:
+            response = await self.get_response(request)
+            if db_router.wrote.get():
+                self.pin(response)
+        finally:
+            self.reset(tokens)
+        return response
+
+    def route(self, request):
+        if request.method in SAFE_METHODS and not self.is_pinned(request):
+            alias = db_router.choose_replica()
+        else:
+            alias = DEFAULT_DB_ALIAS
+        return db_router.read_alias.set(alias), db_router.wrote.set(False)
+
+    @staticmethod
+    def reset(tokens):
+        alias_token, wrote_token = tokens
+        db_router.read_alias.reset(alias_token)
+        db_router.wrote.reset(wrote_token)
+
+    @staticmethod
+    def is_pinned(request):
+        cookie = request.COOKIES.get(settings.READ_YOUR_WRITES['COOKIE'])
+        try:
+            return float(cookie) > time.time()
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def pin(response):
+        window = settings.READ_YOUR_WRITES['WINDOW']
+        response.set_cookie(
+            settings.READ_YOUR_WRITES['COOKIE'],
+            str(time.time() + window),
+            max_age=window,
+            httponly=True,
+            samesite='Lax',
+        )
@@ -0,0 +1,126 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .cache import cached_response
+from .fast_serializers import values_serializer
+from .filters import FullTextSearchFilter
+
+
+class EagerLoadingMixin:
+    """
+    Применяет к queryset вьюсета `select_related`/`only`,
+    объявленные в сериализаторе, для списков и отдельных объектов.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
+
+class SearchSerializerMixin:
+    """
+    Отдаёт результаты поиска сериализатором `search_serializer_class`
+    с полями релевантности и фрагмента текста.
+    """
+    search_serializer_class = None
+
+    def get_serializer_class(self):
+        if (self.action == 'list'
+                and FullTextSearchFilter.get_search_query(self.request)):
+            return self.search_serializer_class
+        return super().get_serializer_class()
+
+
+class FastListMixin:
+    """
+    Отдаёт list() из строк `.values()` через ValuesSerializer,
+    собранный из `serializer_class`, с тем же JSON, что и у DRF.
+    """
+
+    def get_values_serializer(self):
+        return values_serializer(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        queryset = serializer.values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        data = serializer.serialize(rows, self.get_serializer_context())
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class CachedResponseMixin:
+    """
+    Кэширует ответы list/retrieve на анонимные GET-запросы.
+    Кэш сбрасывается сменой версии `cache_namespace` при записи моделей.
+    """
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            self.cache_namespace, request,
+            lambda: super(CachedResponseMixin, self).list(
+                request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            self.cache_namespace, request,
+            lambda: super(CachedResponseMixin, self).retrieve(
+                request, *args, **kwargs)
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Поддержка ETag/Last-Modified для действий из `conditional_actions`.
+    Валидаторы строятся по отметке `get_modified_stamp()`, поэтому
+    ответ 304 отдаётся без загрузки объектов и сериализации.
+    """
+    conditional_actions = ('retrieve',)
+
+    def get_modified_stamp(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, 'list',
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, 'retrieve',
+            lambda: super(ConditionalGetMixin, self).retrieve(
+                request, *args, **kwargs)
+        )
+
+    def conditional_response(self, request, action, handler):
+        if (request.method not in ('GET', 'HEAD')
+                or action not in self.conditional_actions):
+            return handler()
+        stamp = self.get_modified_stamp()
+        if stamp is None:
+            return handler()
+        raw = (f'{request.get_full_path()}:{request.accepted_media_type}:'
+               f'{stamp.isoformat()}')
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        last_modified = int(stamp.timestamp())
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
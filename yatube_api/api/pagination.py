@@ -1,8 +1,288 @@
-from rest_framework.pagination import LimitOffsetPagination
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
 
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import (
+    BasePagination, LimitOffsetPagination, _positive_int
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-class PostPagination(LimitOffsetPagination):
-    """Класс пагинации для публикаций."""
-    page_size = 10
-    page_size_query_param = 'limit'
-    max_page_size = 100
+from .filters import FullTextSearchFilter, IndexedOrderingFilter
+
+
+def scope_limits(view, default_limit, max_limit):
+    """
+    Размер страницы по умолчанию и наибольший допустимый для
+    представления: из settings.API_PAGINATION[view.pagination_scope],
+    иначе — значения класса пагинации.
+    """
+    scope = getattr(view, 'pagination_scope', None)
+    options = settings.API_PAGINATION.get(scope, {})
+    return (options.get('DEFAULT_LIMIT', default_limit),
+            options.get('MAX_LIMIT', max_limit))
+
+
+def parse_cursor_datetime(value):
+    """Момент времени с часовым поясом из курсора."""
+    if not isinstance(value, str):
+        raise ValueError(value)
+    moment = parse_datetime(value)
+    if moment is None or timezone.is_naive(moment):
+        raise ValueError(value)
+    return moment
+
+
+def parse_cursor_int(value):
+    """Целое число из курсора."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация.
+
+    Позиция страницы задаётся значениями полей `ordering` последней
+    выданной записи, поэтому глубокие страницы не требуют OFFSET,
+    а выдача не пересчитывает общее количество записей.
+    Последнее поле сортировки должно быть уникальным.
+    """
+    ordering = ('-pub_date', '-id')
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = 10
+    max_limit = 100
+    invalid_cursor_message = 'Некорректный курсор.'
+    # Разбор значений курсора по полям сортировки: ValueError или
+    # TypeError означают некорректный курсор.
+    cursor_parsers = {
+        'pub_date': parse_cursor_datetime,
+        'id': parse_cursor_int,
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.default_limit, self.max_limit = scope_limits(
+            view, self.default_limit, self.max_limit)
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        position, self.reverse = self.decode_cursor(request)
+        self.has_cursor = position is not None
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self._invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        rows = list(queryset[:self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = self.has_cursor, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        """Возвращает ссылку на страницу после (или до) записи `row`."""
+        position = [
+            self._serialize(self._get_value(row, field))
+            for field in self._field_names()
+        ]
+        payload = json.dumps({'p': position, 'r': int(reverse)})
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token.rstrip('=')
+        )
+
+    def decode_cursor(self, request):
+        """Разбирает курсор запроса в пару (позиция, направление)."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padding = '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(token + padding))
+            position = payload['p']
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list)
+                or len(position) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                self.cursor_parsers[name](value)
+                for name, value in zip(self._field_names(), position)
+            ]
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def _after(self, ordering, position):
+        """
+        Условие «строго после позиции» для составного ключа сортировки:
+        (a < x) OR (a = x AND b < y) OR ...
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _get_value(row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        return value
+
+
+class CappedLimitOffsetPagination(LimitOffsetPagination):
+    """
+    limit/offset с ограничениями из settings.API_PAGINATION по
+    `pagination_scope` представления: `limit` не больше MAX_LIMIT.
+
+    Без `limit` ответ остаётся простым списком, но не длиннее
+    DEFAULT_LIMIT записей (с учётом `offset`); продолжение выдачи
+    передаётся ссылкой в заголовке `Link: <...>; rel="next"`.
+    Общее количество записей в этом режиме не считается.
+    """
+    default_limit = 10
+    max_limit = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.default_limit, self.max_limit = scope_limits(
+            view, self.default_limit, self.max_limit)
+        self.unpaginated = self.limit_query_param not in request.query_params
+        if not self.unpaginated:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.limit = self.default_limit
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_paginated_response(self, data):
+        if not self.unpaginated:
+            return super().get_paginated_response(data)
+        response = Response(data)
+        if self.has_next:
+            response['Link'] = f'<{self.get_next_link()}>; rel="next"'
+        return response
+
+    def get_next_link(self):
+        if not self.unpaginated:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = replace_query_param(
+            self.request.build_absolute_uri(), self.limit_query_param,
+            self.limit
+        )
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+
+class PostPagination(CappedLimitOffsetPagination):
+    """
+    Класс пагинации для публикаций.
+
+    По умолчанию работает через limit/offset; при наличии в запросе
+    параметра `cursor` (пустого для первой страницы) переключается
+    на курсорную пагинацию: по (-pub_date, -id) или по сортировке
+    из `?ordering=`, уже проверенной IndexedOrderingFilter. Порядок
+    результатов поиска по релевантности курсором не выражается,
+    поэтому `cursor` вместе с `search` — ошибка 400.
+    """
+    keyset_class = KeysetPagination
+    search_cursor_message = 'Курсор нельзя сочетать с параметром search.'
+    ordering_cursor_message = 'Курсор не поддерживает эту сортировку.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            self.keyset.ordering = self.get_keyset_ordering(queryset,
+                                                            request)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_keyset_ordering(self, queryset, request):
+        if FullTextSearchFilter.get_search_query(request):
+            self.reject(self.search_cursor_message)
+        if IndexedOrderingFilter.ordering_param not in request.query_params:
+            return self.keyset_class.ordering
+        ordering = tuple(queryset.query.order_by)
+        parsers = self.keyset_class.cursor_parsers
+        if not ordering or any(field.lstrip('-') not in parsers
+                               for field in ordering):
+            self.reject(self.ordering_cursor_message)
+        return ordering
+
+    def reject(self, message):
+        raise ValidationError(
+            {self.keyset_class.cursor_query_param: [message]}
+        )
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,38 @@
+import re
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Так orjson записывает числа, которые json пишет иначе: с показателем
+# степени (1e-6 вместо 1e-06) или без него (0.000015 вместо 1.5e-05).
+# Совпадение внутри строки лишь отправляет ответ рендереру DRF.
+FLOAT_MISMATCH = re.compile(rb'\d[eE]|0\.0000')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson с тем же компактным выводом, что и у DRF.
+
+    При запросе отступов, нестандартных настройках JSON в REST_FRAMEWORK
+    и числах, которые orjson записывает не так, как json (FLOAT_MISMATCH),
+    используется рендерер DRF.
+    """
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (data is None or self.ensure_ascii
+                or not self.compact or self.get_indent(
+                    accepted_media_type, renderer_context or {}
+                ) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(
+            data, default=self.encoder.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+        if FLOAT_MISMATCH.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и DRF, экранируем U+2028 и U+2029.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -1,41 +1,130 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import reverse
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
 
+from posts import images
 from posts.models import Comment, Post, Group, Follow, User
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class EagerLoadingSerializerMixin:
+    """
+    Описывает связи и колонки, которые нужны сериализатору,
+    чтобы список любой длины загружался фиксированным числом запросов.
+    """
+    select_related_fields = ()
+    only_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.only_fields:
+            queryset = queryset.only(*cls.only_fields)
+        return queryset
+
+
+class GroupSerializer(EagerLoadingSerializerMixin,
+                      serializers.ModelSerializer):
     """Сериализатор для модели Group."""
     class Meta:
         model = Group
         fields = '__all__'
 
 
-class PostSerializer(serializers.ModelSerializer):
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Ссылки на уменьшенные копии изображения:
+    {размер: {формат: url}} или None, если изображения нет.
+    Копия создаётся при первом переходе по ссылке.
+    """
+
+    def to_representation(self, value):
+        return self.variant_urls(value, self.context.get('request'))
+
+    @staticmethod
+    def variant_urls(value, request):
+        name = getattr(value, 'name', value)
+        if not name:
+            return None
+        options = settings.POST_IMAGES
+        urls = {}
+        for size in options['SIZES']:
+            urls[size] = {}
+            for image_format in options['FORMATS']:
+                url = reverse('post-image-variant', kwargs={
+                    'size': size, 'image_format': image_format, 'name': name,
+                })
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls[size][image_format] = url
+        return urls
+
+
+class PostSerializer(EagerLoadingSerializerMixin,
+                     serializers.ModelSerializer):
     author = SlugRelatedField(slug_field='username', read_only=True)
+    image_variants = ImageVariantsField(source='image')
+
+    select_related_fields = ('author',)
+    only_fields = (
+        'id', 'text', 'pub_date', 'image', 'group', 'comments_count',
+        'last_comment_at', 'modified', 'author__username',
+    )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('modified',)
         model = Post
+        read_only_fields = ['comments_count', 'last_comment_at']
+
+    def validate_image(self, value):
+        """Проверяет размеры изображения и удаляет его метаданные."""
+        if value is None:
+            return value
+        try:
+            return images.validate_image(value)
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
+
+class PostSearchSerializer(PostSerializer):
+    """Пост в результатах поиска."""
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+    snippet = serializers.CharField(source='search_snippet', read_only=True)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(EagerLoadingSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
     post = serializers.PrimaryKeyRelatedField(read_only=True)
 
+    select_related_fields = ('author',)
+    only_fields = ('id', 'text', 'created', 'post', 'author__username')
+
     class Meta:
         fields = '__all__'
         model = Comment
         read_only_fields = ['author', 'post']
 
 
-class FollowSerializer(serializers.ModelSerializer):
+class CommentSearchSerializer(CommentSerializer):
+    """Комментарий в результатах поиска."""
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+    snippet = serializers.CharField(source='search_snippet', read_only=True)
+
+
+class FollowSerializer(EagerLoadingSerializerMixin,
+                       serializers.ModelSerializer):
     user = serializers.SlugRelatedField(slug_field='username', read_only=True)
     following = serializers.SlugRelatedField(slug_field='username',
                                              queryset=User.objects.all())
 
+    select_related_fields = ('user', 'following')
+    only_fields = ('id', 'user__username', 'following__username')
+
     class Meta:
         model = Follow
         fields = ['user', 'following']
@@ -44,7 +133,7 @@ class FollowSerializer(serializers.ModelSerializer):
     def validate_following(self, value):
         """Проверка, что пользователь не может подписаться на самого себя."""
         request = self.context.get('request')
-        if value == request.user:
+        if value.pk == request.user.id:
             raise serializers.ValidationError(
                 "Вы не можете подписаться на самого себя."
             )
@@ -54,7 +143,8 @@ class FollowSerializer(serializers.ModelSerializer):
         """Проверка уникальности подписки."""
         user = self.context['request'].user
         following = attrs.get('following')
-        if Follow.objects.filter(user=user, following=following).exists():
+        if Follow.objects.filter(user_id=user.id,
+                                 following=following).exists():
             raise serializers.ValidationError(
                 "Вы уже подписаны на этого пользователя."
             )
@@ -63,5 +153,5 @@ class FollowSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Создание новой подписки."""
         request = self.context['request']
-        validated_data['user'] = request.user
+        validated_data['user_id'] = request.user.id
         return super().create(validated_data)
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_states
+from .cache import bump_version_on_commit
+from .groups import group_cache
+from posts.models import Comment, Group, Post
+from posts.signals import data_imported, posts_changed
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Post)
+def post_changed(sender, **kwargs):
+    bump_version_on_commit('posts')
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def comment_changed(sender, **kwargs):
+    # Комментарии меняют и счётчики в ответах постов.
+    bump_version_on_commit('comments', 'posts')
+
+
+@receiver([post_save, post_delete], sender=Group)
+def group_changed(sender, **kwargs):
+    # Удаление группы обнуляет Post.group без сигналов Post.
+    group_cache.clear()
+    bump_version_on_commit('groups', 'posts')
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_state_changed(sender, instance, **kwargs):
+    user_states.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, update_fields=None, **kwargs):
+    # Имя автора входит в ответы постов и комментариев;
+    # last_login обновляется при каждом входе и на ответы не влияет.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_version_on_commit('posts', 'comments')
+
+
+@receiver(data_imported)
+def data_bulk_loaded(sender, **kwargs):
+    group_cache.clear()
+    bump_version_on_commit('posts', 'comments', 'groups')
+
+
+@receiver(posts_changed)
+def posts_updated(sender, **kwargs):
+    bump_version_on_commit('posts')
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    # Выполняется мимо курсора Django, чтобы не попадать в счётчики
+    # запросов и бюджет представления, открывшего соединение.
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
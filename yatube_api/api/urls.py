@@ -1,17 +1,67 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView, TokenVerifyView
+)
 
-from .views import CommentViewSet, GroupViewSet, PostViewSet, FollowViewSet
+from . import async_views
+from .authentication import (
+    CachedTokenVerifySerializer, ClaimsTokenObtainPairSerializer
+)
+from .views import (
+    CacheStatsView,
+    CommentViewSet,
+    ExportView,
+    ImageVariantView,
+    FeedViewSet,
+    FollowViewSet,
+    GroupPostViewSet,
+    GroupViewSet,
+    PostViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'groups', GroupViewSet, basename='group')
+router.register(r'groups/(?P<group_slug>[-\w]+)/posts', GroupPostViewSet,
+                basename='group-post')
 router.register(r'posts', PostViewSet, basename='post')
 router.register(r'follow', FollowViewSet, basename='follow')
+router.register(r'feed', FeedViewSet, basename='feed')
 router.register(r'posts/(?P<post_id>[^/.]+)/comments',
                 CommentViewSet, basename='comment')
 
 urlpatterns = [
     path('v1/', include(router.urls)),
+    path('v1/cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('v1/export/', ExportView.as_view(), name='export'),
+    path(
+        'v1/images/<slug:size>/<slug:image_format>/<path:name>',
+        ImageVariantView.as_view(),
+        name='post-image-variant'
+    ),
+    path(
+        'v1/jwt/create/',
+        TokenObtainPairView.as_view(
+            serializer_class=ClaimsTokenObtainPairSerializer
+        ),
+        name='jwt-create'
+    ),
+    path(
+        'v1/jwt/verify/',
+        TokenVerifyView.as_view(serializer_class=CachedTokenVerifySerializer),
+        name='jwt-verify'
+    ),
+    path('v1/async/posts/', async_views.post_list, name='async-post-list'),
+    path('v1/async/posts/<int:pk>/', async_views.post_detail,
+         name='async-post-detail'),
+    path('v1/async/posts/<int:post_id>/comments/', async_views.comment_list,
+         name='async-comment-list'),
+    path('v1/async/posts/<int:post_id>/comments/<int:pk>/',
+         async_views.comment_detail, name='async-comment-detail'),
+    path('v1/async/groups/', async_views.group_list,
+         name='async-group-list'),
+    path('v1/async/groups/<int:pk>/', async_views.group_detail,
+         name='async-group-detail'),
     path('v1/', include('djoser.urls')),
     path('v1/', include('djoser.urls.jwt')),
 ]
@@ -1,65 +1,310 @@
+from django.conf import settings
+from django.db import transaction
+from django.core.files.storage import default_storage
+from django.http import HttpResponseRedirect, StreamingHttpResponse
 from django_filters import rest_framework as filters
-from rest_framework import permissions, viewsets
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from .filters import FollowFilter
-from .pagination import PostPagination
+from .authentication import StatelessJWTAuthentication, token_cache
+from .cache import bump_version_on_commit, get_stats
+from .filters import (
+    FollowFilter, FullTextSearchFilter, IndexedOrderingFilter, PostFilter,
+)
+from .groups import group_cache
+from .mixins import (
+    CachedResponseMixin, ConditionalGetMixin, EagerLoadingMixin,
+    FastListMixin, SearchSerializerMixin,
+)
+from .pagination import (
+    CappedLimitOffsetPagination, KeysetPagination, PostPagination,
+)
 from .permissions import IsAuthenticatedOrAuthor, IsAuthenticatedForSafeMethods
 from .serializers import (
+    CommentSearchSerializer,
     CommentSerializer,
     GroupSerializer,
+    PostSearchSerializer,
     PostSerializer,
     FollowSerializer,
 )
-from posts.models import Comment, Group, Post, Follow
+from posts import images, services, tasks
+from posts.export import export_records, post_filters, to_ndjson
+from posts.models import Comment, Post, Follow
+
+
+def post_modified_stamp(post_id):
+    """Отметка изменения поста или None, если пост не найден."""
+    try:
+        return Post.objects.filter(pk=post_id).values_list(
+            'modified', flat=True).first()
+    except (TypeError, ValueError):
+        return None
 
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
-    """ViewSet для работы с группами."""
-    queryset = Group.objects.all()
+class GroupViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet для работы с группами; группы берутся из group_cache."""
+    cache_namespace = 'groups'
+    query_budget = 2
     serializer_class = GroupSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [permissions.AllowAny]
+    pagination_class = CappedLimitOffsetPagination
+    pagination_scope = 'groups'
+
+    def get_queryset(self):
+        return group_cache.all()
+
+    def get_object(self):
+        group = group_cache.get(self.kwargs['pk'])
+        if group is None:
+            raise NotFound('Группа не найдена.')
+        self.check_object_permissions(self.request, group)
+        return group
 
 
-class PostViewSet(viewsets.ModelViewSet):
-    """ViewSet для работы с постами."""
+class GroupPostViewSet(CachedResponseMixin, FastListMixin, EagerLoadingMixin,
+                       mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Посты группы по её slug от новых к старым с курсорной пагинацией:
+    выборка идёт по индексу (group, -pub_date, -id).
+    """
+    cache_namespace = 'posts'
+    query_budget = 3
+    serializer_class = PostSerializer
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+    pagination_scope = 'posts'
+
+    def get_group(self):
+        group = group_cache.get_by_slug(self.kwargs['group_slug'])
+        if group is None:
+            raise NotFound('Группа не найдена.')
+        return group
+
+    def get_queryset(self):
+        return Post.objects.filter(
+            group_id=self.get_group().id).select_related('author')
+
+
+class PostViewSet(ConditionalGetMixin, CachedResponseMixin, FastListMixin,
+                  SearchSerializerMixin, EagerLoadingMixin,
+                  viewsets.ModelViewSet):
+    """
+    ViewSet для работы с постами: фильтры PostFilter, `?ordering=`
+    по дате публикации и полнотекстовый поиск `?search=`.
+    """
+    cache_namespace = 'posts'
+    query_budget = {
+        'list': 4, 'retrieve': 4, 'create': 5, 'update': 5,
+        'partial_update': 5, 'destroy': 10, 'bulk_create': 12,
+    }
     queryset = Post.objects.all()
     serializer_class = PostSerializer
+    search_serializer_class = PostSearchSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticatedOrAuthor]
     pagination_class = PostPagination
+    pagination_scope = 'posts'
+    filter_backends = (filters.DjangoFilterBackend, FullTextSearchFilter,
+                       IndexedOrderingFilter)
+    filterset_class = PostFilter
+    ordering_fields = ['pub_date']
+    ordering = ['pub_date']
 
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
             return [permissions.AllowAny()]
         return super().get_permissions()
 
+    def get_modified_stamp(self):
+        return post_modified_stamp(self.kwargs['pk'])
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        """Переопределяет метод создания поста."""
-        serializer.save(author=self.request.user)
+        """Создаёт пост и ставит раскладку по лентам в очередь."""
+        post = serializer.save(author_id=self.request.user.id)
+        tasks.fan_out_posts.delay(post_ids=[post.id])
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Создаёт список постов одной транзакцией.
+        Ошибки валидации возвращаются списком по позициям запроса.
+        """
+        limit = settings.POSTS_BULK_CREATE_MAX
+        if isinstance(request.data, list) and len(request.data) > limit:
+            raise ValidationError({'non_field_errors': [
+                f'За один запрос можно создать не более {limit} постов.'
+            ]})
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            posts = services.bulk_create_posts(
+                request.user.id, serializer.validated_data
+            )
+            tasks.fan_out_posts.delay(post_ids=[post.id for post in posts])
+            bump_version_on_commit('posts')
+        return Response(
+            self.get_serializer(posts, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    """ViewSet для работы с комментариями."""
+class CommentViewSet(ConditionalGetMixin, CachedResponseMixin,
+                     FastListMixin, SearchSerializerMixin, EagerLoadingMixin,
+                     viewsets.ModelViewSet):
+    """ViewSet для работы с комментариями; `?search=` — поиск по посту."""
+    cache_namespace = 'comments'
+    conditional_actions = ('list', 'retrieve')
+    query_budget = {
+        'list': 4, 'retrieve': 4, 'create': 5, 'update': 6,
+        'partial_update': 6, 'destroy': 5,
+    }
     serializer_class = CommentSerializer
+    search_serializer_class = CommentSearchSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticatedOrAuthor]
+    filter_backends = (FullTextSearchFilter,)
+    pagination_class = CappedLimitOffsetPagination
+    pagination_scope = 'comments'
 
     def get_queryset(self):
         """Возвращает набор комментариев для конкретного поста."""
         post_id = self.kwargs['post_id']
-        return Comment.objects.filter(post_id=post_id)
+        return Comment.objects.filter(post_id=post_id).order_by(
+            'created', 'id')
 
+    def get_modified_stamp(self):
+        return post_modified_stamp(self.kwargs['post_id'])
+
+    @transaction.atomic
     def perform_create(self, serializer):
         """Переопределяет метод создания комментария."""
         post_id = self.kwargs['post_id']
-        serializer.save(author=self.request.user, post_id=post_id)
+        serializer.save(author_id=self.request.user.id, post_id=post_id)
+        # ETag списка комментариев строится по Post.modified: отметка
+        # сдвигается в транзакции запроса, в задаче — только пересчёт.
+        services.touch_posts(pk=post_id)
+        tasks.refresh_comment_counters.delay(post_id=post_id)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Изменяет комментарий и отметку изменения поста."""
+        comment = serializer.save()
+        services.touch_posts(pk=comment.post_id)
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """Удаляет комментарий и обновляет счётчики поста."""
+        instance.delete()
+        services.touch_posts(pk=instance.post_id)
+        tasks.refresh_comment_counters.delay(post_id=instance.post_id)
 
-class FollowViewSet(viewsets.ModelViewSet):
+
+class FollowViewSet(FastListMixin, EagerLoadingMixin,
+                    viewsets.ModelViewSet):
     """ViewSet для управления подписками пользователей."""
     serializer_class = FollowSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticatedForSafeMethods]
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = FollowFilter
+    pagination_class = CappedLimitOffsetPagination
+    pagination_scope = 'follow'
+    query_budget = {'list': 3, 'create': 8}
 
     def get_queryset(self):
         """Возвращает список подписок текущего пользователя."""
-        return Follow.objects.filter(user=self.request.user)
+        return Follow.objects.filter(
+            user_id=self.request.user.id).order_by('following_name', 'id')
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        """Создаёт подписку и ставит в очередь дополнение ленты."""
+        follow = serializer.save()
+        tasks.backfill_feed.delay(user_id=follow.user_id,
+                                  following_id=follow.following_id)
+
+
+class FeedViewSet(FastListMixin, EagerLoadingMixin, mixins.ListModelMixin,
+                  viewsets.GenericViewSet):
+    """ViewSet ленты постов авторов, на которых подписан пользователь."""
+    serializer_class = PostSerializer
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    pagination_scope = 'feed'
+    query_budget = 4
+
+    def get_queryset(self):
+        return services.feed_posts(self.request.user.id)
+
+
+class CacheStatsView(APIView):
+    """Счётчики попаданий и промахов кэшей ответов и токенов API."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'responses': get_stats(),
+            'tokens': token_cache.stats(),
+        })
+
+
+class ExportView(APIView):
+    """
+    Потоковая выгрузка постов и комментариев в NDJSON.
+    Фильтры: author, group, since, until; comments=0 отключает комментарии.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            filters = post_filters(
+                params.get('author'), params.get('group'),
+                params.get('since'), params.get('until')
+            )
+        except ValueError as error:
+            raise ValidationError({'detail': str(error)})
+        records = export_records(
+            filters, comments=params.get('comments') != '0'
+        )
+        response = StreamingHttpResponse(
+            (line.encode() for line in to_ndjson(records)),
+            content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = 'attachment; filename="posts.ndjson"'
+        return response
+
+
+class ImageVariantView(APIView):
+    """
+    Уменьшенная копия изображения поста: создаётся при первом
+    запросе и отдаётся перенаправлением на файл в MEDIA_URL.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    query_budget = 0
+
+    def get(self, request, size, image_format, name):
+        options = settings.POST_IMAGES
+        if (size not in options['SIZES']
+                or image_format not in options['FORMATS']
+                or not images.is_original(name)):
+            raise NotFound()
+        try:
+            variant = images.ensure_variant(name, size, image_format)
+        except OSError:
+            # Нет оригинала или он не читается как изображение.
+            raise NotFound()
+        response = HttpResponseRedirect(default_storage.url(variant))
+        response['Cache-Control'] = 'public, max-age=86400'
+        return response
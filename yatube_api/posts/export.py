@@ -0,0 +1,99 @@
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Comment, Post
+
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'image': 'image',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'post': 'post_id',
+    'text': 'text',
+    'created': 'created',
+    'author': 'author__username',
+}
+
+
+class ExportEncoder(DjangoJSONEncoder):
+    """Сохраняет микросекунды дат, чтобы импорт восстановил их точно."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def parse_moment(value):
+    """Разбирает дату или дату-время в формате ISO 8601."""
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Некорректная дата: {value}')
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, datetime.timezone.utc)
+    return moment
+
+
+def post_filters(author=None, group=None, since=None, until=None):
+    """Условия отбора постов для выгрузки."""
+    filters = {}
+    if author:
+        filters['author__username'] = author
+    if group:
+        filters['group__slug'] = group
+    if since:
+        filters['pub_date__gte'] = parse_moment(since)
+    if until:
+        filters['pub_date__lt'] = parse_moment(until)
+    return filters
+
+
+def _records(record_type, queryset, fields, chunk_size):
+    rows = queryset.values_list(*fields.values())
+    for row in rows.iterator(chunk_size=chunk_size):
+        record = dict(zip(fields, row))
+        record['type'] = record_type
+        if record.get('image') == '':
+            record['image'] = None
+        yield record
+
+
+def export_records(filters, comments=True, chunk_size=2000):
+    """
+    Выдаёт посты и комментарии к ним по одной записи.
+    Чтение идёт в одной транзакции, поэтому выгрузка видит
+    согласованный снимок даже при параллельной записи.
+    """
+    with transaction.atomic():
+        posts = Post.objects.filter(**filters).order_by('id')
+        yield from _records('post', posts, POST_FIELDS, chunk_size)
+        if comments:
+            post_comments = Comment.objects.filter(
+                post__in=posts.values('id')
+            ).order_by('id')
+            yield from _records(
+                'comment', post_comments, COMMENT_FIELDS, chunk_size
+            )
+
+
+def to_ndjson(records):
+    """Превращает записи в строки NDJSON."""
+    for record in records:
+        yield json.dumps(
+            record, cls=ExportEncoder, ensure_ascii=False
+        ) + '\n'
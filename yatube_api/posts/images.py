@@ -0,0 +1,139 @@
+"""
+Обработка изображений постов: проверка загрузки, удаление
+метаданных и уменьшенные копии (варианты) в WebP и JPEG.
+
+Варианты хранятся рядом с оригиналом в `posts/variants/` и
+создаются при первом запросе или заранее фоновой задачей после
+сохранения поста (POST_IMAGES['PREGENERATE']).
+"""
+import io
+import os
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+VARIANTS_DIR = 'variants'
+PIL_FORMATS = {'jpeg': 'JPEG', 'webp': 'WEBP', 'png': 'PNG'}
+
+_save_lock = threading.Lock()
+
+
+def validate_image(upload):
+    """
+    Проверяет размер файла и изображения и возвращает копию
+    без метаданных (EXIF, ICC, текстовые блоки PNG) с учётом
+    ориентации из EXIF.
+    """
+    options = settings.POST_IMAGES
+    if upload.size > options['MAX_BYTES']:
+        raise ValidationError(
+            f'Размер файла не должен превышать {options["MAX_BYTES"]} байт.'
+        )
+    upload.seek(0)
+    try:
+        image = Image.open(upload)
+        image_format = image.format
+        width, height = image.size
+        if width > options['MAX_WIDTH'] or height > options['MAX_HEIGHT']:
+            raise ValidationError(
+                f'Изображение должно быть не больше '
+                f'{options["MAX_WIDTH"]}x{options["MAX_HEIGHT"]} пикселей.'
+            )
+        if image_format.lower() not in options['UPLOAD_FORMATS']:
+            raise ValidationError(
+                f'Формат {image_format} не поддерживается.'
+            )
+        image = ImageOps.exif_transpose(image)
+        content = encode(image, image_format.lower(), quality=95)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValidationError('Загрузите корректное изображение.')
+    name = os.path.splitext(os.path.basename(upload.name))[0]
+    extension = 'jpg' if image_format == 'JPEG' else image_format.lower()
+    return ContentFile(content, name=f'{name}.{extension}')
+
+
+def encode(image, image_format, quality):
+    """Кодирует изображение, не передавая исходные метаданные."""
+    if image_format == 'jpeg' and image.mode not in ('RGB', 'L'):
+        image = flatten(image)
+    elif image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+        image = image.convert('RGBA')
+    # Кодировщики PNG и WebP берут EXIF и ICC из image.info, если их
+    # не передали явно; оставляем только прозрачность палитры.
+    image.info = {
+        key: value for key, value in image.info.items()
+        if key == 'transparency'
+    }
+    output = io.BytesIO()
+    image.save(output, PIL_FORMATS[image_format], quality=quality)
+    return output.getvalue()
+
+
+def flatten(image):
+    """Накладывает изображение с прозрачностью на белый фон."""
+    image = image.convert('RGBA')
+    background = Image.new('RGB', image.size, 'white')
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def variant_name(name, size, image_format):
+    """Путь варианта `size` в формате `image_format` для оригинала."""
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    extension = 'jpg' if image_format == 'jpeg' else image_format
+    return os.path.join(
+        directory, VARIANTS_DIR, f'{stem}_{size}.{extension}'
+    ).replace(os.sep, '/')
+
+
+def is_original(name):
+    """Имя указывает на оригинал изображения поста, а не на вариант."""
+    parts = name.split('/')
+    return (
+        len(parts) == 2 and parts[0] == 'posts' and parts[1]
+        and not parts[1].startswith('.')
+    )
+
+
+def ensure_variant(name, size, image_format):
+    """
+    Возвращает имя варианта в хранилище, создавая его при отсутствии.
+    FileNotFoundError — оригинала нет.
+    """
+    target = variant_name(name, size, image_format)
+    if default_storage.exists(target):
+        return target
+    options = settings.POST_IMAGES
+    with default_storage.open(name) as original:
+        image = Image.open(original)
+        image.load()
+    width = options['SIZES'][size]
+    image.thumbnail((width, width))
+    content = encode(image, image_format, quality=options['QUALITY'])
+    with _save_lock:
+        if not default_storage.exists(target):
+            default_storage.save(target, ContentFile(content))
+    return target
+
+
+def generate_variants(name):
+    """Создаёт все варианты изображения."""
+    options = settings.POST_IMAGES
+    for size in options['SIZES']:
+        for image_format in options['FORMATS']:
+            ensure_variant(name, size, image_format)
+
+
+def delete_variants(name):
+    """Удаляет созданные варианты изображения."""
+    options = settings.POST_IMAGES
+    for size in options['SIZES']:
+        for image_format in options['FORMATS']:
+            target = variant_name(name, size, image_format)
+            if default_storage.exists(target):
+                default_storage.delete(target)
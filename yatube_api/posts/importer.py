@@ -0,0 +1,244 @@
+import json
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .export import parse_moment
+from .models import Comment, Follow, Group, Post, username_key
+
+User = get_user_model()
+
+
+class NDJSONImporter:
+    """
+    Потоковый импорт записей user, group, post, comment и follow.
+
+    Записи копятся в буферах и пишутся пакетами через bulk_create;
+    имена пользователей и slug групп разрешаются через кэши в памяти.
+    Записи со ссылками на несуществующие объекты пропускаются.
+
+    id постов и комментариев из файла не переиспользуются: посты
+    получают новые id, а комментарии ссылаются на них через карту
+    «id в файле -> id в базе». Даты публикации из файла записываются
+    отдельным обновлением после вставки.
+    """
+    order = ('user', 'group', 'post', 'comment', 'follow')
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.buffers = {record_type: [] for record_type in self.order}
+        self.users = {}
+        self.groups = {}
+        self.posts = {}
+        self.written = Counter()
+        self.skipped = Counter()
+        self.rows = 0
+        self.elapsed = 0.0
+
+    def run(self, lines):
+        start = time.perf_counter()
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if line:
+                self.add(self._parse(line, number))
+        self.flush()
+        self.elapsed = time.perf_counter() - start
+        return self
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def add(self, record):
+        record_type = record.get('type')
+        if record_type not in self.buffers:
+            self.skipped[record_type or 'unknown'] += 1
+            return
+        self.rows += 1
+        buffer = self.buffers[record_type]
+        buffer.append(record)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Пишет все буферы в порядке зависимостей между моделями."""
+        with transaction.atomic():
+            for record_type in self.order:
+                records = self.buffers[record_type]
+                if records:
+                    getattr(self, f'_flush_{record_type}')(records)
+                    self.buffers[record_type] = []
+
+    def _parse(self, line, number):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ValueError(f'Строка {number}: некорректный JSON.')
+        if not isinstance(record, dict):
+            raise ValueError(f'Строка {number}: ожидается объект.')
+        return record
+
+    def _bulk_create(self, record_type, model, objects, **kwargs):
+        model.objects.bulk_create(
+            objects, batch_size=self.batch_size, **kwargs
+        )
+        self.written[record_type] += len(objects)
+
+    def _create_new(self, record_type, model, objects, key, existing):
+        """
+        Создаёт объекты, чьих ключей `key(obj)` нет среди `existing`
+        и которые не повторяются в пакете; остальные пропускает.
+        ignore_conflicts остаётся на случай параллельной записи.
+        """
+        new = {}
+        for obj in objects:
+            if key(obj) in existing or key(obj) in new:
+                self.skipped[record_type] += 1
+            else:
+                new[key(obj)] = obj
+        self._bulk_create(record_type, model, list(new.values()),
+                          ignore_conflicts=True)
+
+    def _create_with_ids(self, record_type, model, objects, timestamp):
+        """
+        Создаёт объекты с новыми id и возвращает их с проставленными id.
+        Поле `timestamp` с auto_now_add bulk_create заполняет текущим
+        временем, поэтому значения из файла записываются следом.
+        """
+        if not objects:
+            return objects
+        stamps = [getattr(obj, timestamp) for obj in objects]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # SQLite не возвращает id из пакетной вставки: id выдаются
+            # после наибольшего в транзакции импорта. Параллельная
+            # запись с тем же id прервёт импорт IntegrityError.
+            start = model.objects.aggregate(top=Max('id'))['top'] or 0
+            for number, obj in enumerate(objects, start + 1):
+                obj.id = number
+        self._bulk_create(record_type, model, objects)
+        quote = connection.ops.quote_name
+        field = model._meta.get_field(timestamp)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE {quote(model._meta.db_table)} '
+                f'SET {quote(field.column)} = %s WHERE id = %s',
+                [(field.get_db_prep_value(stamp, connection), obj.id)
+                 for obj, stamp in zip(objects, stamps)],
+            )
+        for obj, stamp in zip(objects, stamps):
+            setattr(obj, timestamp, stamp)
+        return objects
+
+    def _resolve(self, cache, model, field, keys):
+        missing = {key for key in keys if key and key not in cache}
+        if missing:
+            cache.update(model.objects.filter(
+                **{f'{field}__in': missing}
+            ).values_list(field, 'id'))
+        return cache
+
+    def _flush_user(self, records):
+        password = make_password(None)
+        users = [
+            User(username=record['username'],
+                 email=record.get('email', ''),
+                 password=password)
+            for record in records
+        ]
+        existing = set(User.objects.filter(
+            username__in=[user.username for user in users]
+        ).values_list('username', flat=True))
+        self._create_new('user', User, users,
+                         lambda user: user.username, existing)
+
+    def _flush_group(self, records):
+        groups = [
+            Group(title=record.get('title') or record['slug'],
+                  slug=record['slug'],
+                  description=record.get('description', ''))
+            for record in records
+        ]
+        existing = set(Group.objects.filter(
+            slug__in=[group.slug for group in groups]
+        ).values_list('slug', flat=True))
+        self._create_new('group', Group, groups,
+                         lambda group: group.slug, existing)
+
+    def _flush_post(self, records):
+        users = self._resolve(
+            self.users, User, 'username', (r.get('author') for r in records)
+        )
+        groups = self._resolve(
+            self.groups, Group, 'slug', (r.get('group') for r in records)
+        )
+        posts = []
+        file_ids = []
+        for record in records:
+            author_id = users.get(record.get('author'))
+            group = record.get('group')
+            if author_id is None or (group and group not in groups):
+                self.skipped['post'] += 1
+                continue
+            posts.append(Post(
+                text=record['text'],
+                author_id=author_id,
+                group_id=groups.get(group),
+                image=record.get('image') or '',
+                pub_date=parse_moment(record.get('pub_date'))
+                or timezone.now(),
+            ))
+            file_ids.append(record.get('id'))
+        posts = self._create_with_ids('post', Post, posts, 'pub_date')
+        for file_id, post in zip(file_ids, posts):
+            if file_id is not None:
+                self.posts[file_id] = post.id
+
+    def _flush_comment(self, records):
+        users = self._resolve(
+            self.users, User, 'username', (r.get('author') for r in records)
+        )
+        comments = []
+        for record in records:
+            author_id = users.get(record.get('author'))
+            post_id = self.posts.get(record.get('post'))
+            if author_id is None or post_id is None:
+                self.skipped['comment'] += 1
+                continue
+            comments.append(Comment(
+                text=record['text'],
+                author_id=author_id,
+                post_id=post_id,
+                created=parse_moment(record.get('created'))
+                or timezone.now(),
+            ))
+        self._create_with_ids('comment', Comment, comments, 'created')
+
+    def _flush_follow(self, records):
+        names = [record.get(key) for record in records
+                 for key in ('user', 'following')]
+        users = self._resolve(self.users, User, 'username', names)
+        follows = []
+        for record in records:
+            user_id = users.get(record.get('user'))
+            following_id = users.get(record.get('following'))
+            if None in (user_id, following_id) or user_id == following_id:
+                self.skipped['follow'] += 1
+                continue
+            follows.append(Follow(
+                user_id=user_id, following_id=following_id,
+                following_name=username_key(record['following']),
+            ))
+        existing = set(Follow.objects.filter(
+            user_id__in={follow.user_id for follow in follows},
+            following_id__in={follow.following_id for follow in follows},
+        ).values_list('user_id', 'following_id'))
+        # Пары, нарушающие unique_follow, пропускаются.
+        self._create_new(
+            'follow', Follow, follows,
+            lambda follow: (follow.user_id, follow.following_id), existing
+        )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.export import export_records, post_filters, to_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты и комментарии в формате NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--author', help='Имя автора.')
+        parser.add_argument('--group', help='Slug группы.')
+        parser.add_argument('--since', help='Дата публикации от (ISO 8601).')
+        parser.add_argument('--until', help='Дата публикации до (ISO 8601).')
+        parser.add_argument('--no-comments', action='store_true',
+                            help='Не выгружать комментарии.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--output', '-o',
+                            help='Файл для выгрузки, по умолчанию stdout.')
+
+    def handle(self, *args, **options):
+        try:
+            filters = post_filters(
+                options['author'], options['group'],
+                options['since'], options['until']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        lines = to_ndjson(export_records(
+            filters,
+            comments=not options['no_comments'],
+            chunk_size=options['chunk_size'],
+        ))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from posts import services
+from posts.importer import NDJSONImporter
+from posts.signals import data_imported
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает пользователей, группы, посты, комментарии и подписки '
+        'из файла NDJSON (формат export_posts с записями user, group, '
+        'follow).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу NDJSON.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--no-feed', action='store_true',
+                            help='Не заполнять ленты подписчиков.')
+
+    def handle(self, *args, **options):
+        importer = NDJSONImporter(batch_size=options['batch_size'])
+        try:
+            with open(options['path'], encoding='utf-8') as lines:
+                importer.run(lines)
+        except (OSError, ValueError, KeyError, IntegrityError) as error:
+            raise CommandError(f'Импорт прерван: {error!r}')
+        finally:
+            # Пакеты до ошибки уже зафиксированы: счётчики, ленты и кэши
+            # обновляются и после прерванного импорта.
+            if any(importer.written.values()):
+                self.rebuild(options)
+
+        for record_type in importer.order:
+            self.stdout.write(
+                f'{record_type}: записано {importer.written[record_type]}, '
+                f'пропущено {importer.skipped[record_type]}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Строк: {importer.rows} за {importer.elapsed:.2f} с '
+            f'({importer.rows_per_second:.0f} строк/с).'
+        ))
+
+    def rebuild(self, options):
+        services.rebuild_comment_counters()
+        services.rebuild_follower_counters()
+        if not options['no_feed']:
+            services.rebuild_feeds()
+        data_imported.send(sender=self.__class__)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.models import Post
+from posts.services import rebuild_comment_counters
+from posts.signals import posts_changed
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает comments_count и last_comment_at у всех постов '
+        'и сдвигает отметку изменения исправленных.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_comment_counters()
+            if updated:
+                posts_changed.send(sender=Post)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено постов: {updated}.')
+        )
@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from posts import queue
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из outbox: новые, отложенные для '
+        'повтора и зависшие после падения другого обработчика. '
+        'Можно запускать несколько процессов одновременно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help='Потоков на процесс.')
+        parser.add_argument('--batch', type=int, default=100,
+                            help='Задач за один проход.')
+        parser.add_argument('--poll', type=float, default=1.0,
+                            help='Пауза в секундах, когда задач нет.')
+        parser.add_argument('--once', action='store_true',
+                            help='Выйти, когда готовых задач не останется.')
+
+    def handle(self, *args, **options):
+        executor = None
+        if options['concurrency'] > 1:
+            executor = ThreadPoolExecutor(
+                max_workers=options['concurrency'],
+                thread_name_prefix='run-worker',
+            )
+        total = 0
+        try:
+            while True:
+                done = queue.run_due(options['batch'], executor)
+                total += done
+                if not done:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.stdout.write(self.style.SUCCESS(f'Обработано задач: {total}.'))
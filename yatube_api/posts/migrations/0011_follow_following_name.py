@@ -0,0 +1,38 @@
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_following_name(apps, schema_editor):
+    Follow = apps.get_model('posts', 'Follow')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    authors = User.objects.filter(
+        id__in=Follow.objects.values('following_id')
+    ).values_list('id', 'username')
+    for author_id, username in authors.iterator():
+        Follow.objects.filter(following_id=author_id).update(
+            following_name=unicodedata.normalize('NFKC', username).casefold()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0010_outboxtask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='follow',
+            name='following_name',
+            field=models.CharField(default='', editable=False, max_length=150, verbose_name='Имя автора для поиска'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_following_name, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['user', 'following_name'], name='follow_user_name_idx'),
+        ),
+    ]
@@ -1,9 +1,17 @@
+import unicodedata
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
 
+def username_key(username):
+    """Имя пользователя для поиска: без учёта регистра и формы записи."""
+    return unicodedata.normalize('NFKC', username).casefold()
+
+
 class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
@@ -22,6 +30,22 @@ class Post(models.Model):
         upload_to='posts/', null=True, blank=True)
     group = models.ForeignKey(Group, on_delete=models.SET_NULL,
                               null=True, blank=True)
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0)
+    last_comment_at = models.DateTimeField(
+        'Дата последнего комментария', null=True, blank=True)
+    modified = models.DateTimeField(
+        'Дата изменения поста или его комментариев', auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-pub_date', '-id'],
+                         name='post_pub_date_idx'),
+            models.Index(fields=['author', '-pub_date', '-id'],
+                         name='post_author_pub_date_idx'),
+            models.Index(fields=['group', '-pub_date', '-id'],
+                         name='post_group_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.text
@@ -36,18 +60,93 @@ class Comment(models.Model):
     created = models.DateTimeField(
         'Дата добавления', auto_now_add=True, db_index=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'created'],
+                         name='comment_post_created_idx'),
+        ]
+
 
 class Follow(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE,
                              related_name='following')
     following = models.ForeignKey(User, on_delete=models.CASCADE,
                                   related_name='followers')
+    # Копия username_key(following.username): поиск подписок по имени
+    # автора идёт по индексу без join с пользователями.
+    following_name = models.CharField(
+        'Имя автора для поиска', max_length=150, editable=False)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['user', 'following'],
                                     name='unique_follow')
         ]
+        indexes = [
+            models.Index(fields=['user', 'following_name'],
+                         name='follow_user_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} follows {self.following.username}"
+
+
+class AuthorStats(models.Model):
+    """
+    Денормализованные счётчики автора. followers_count поддерживают
+    сигналы Follow, после массовой записи — rebuild_follower_counters().
+    """
+    author = models.OneToOneField(User, on_delete=models.CASCADE,
+                                  primary_key=True, related_name='stats')
+    followers_count = models.PositiveIntegerField(
+        'Число подписчиков', default=0)
+
+
+class FeedEntry(models.Model):
+    """Запись предрассчитанной ленты подписчика (fan-out on write)."""
+    owner = models.ForeignKey(User, on_delete=models.CASCADE,
+                              related_name='feed_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE,
+                             related_name='feed_entries')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'],
+                                    name='unique_feed_entry')
+        ]
+
+
+class OutboxTask(models.Model):
+    """
+    Отложенная задача (outbox): пишется в той же транзакции, что и
+    изменение данных, и выполняется после коммита вне запроса.
+    Для RUNNING поле run_at — срок аренды, после которого задачу
+    может забрать другой обработчик.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    ]
+
+    name = models.CharField('Имя задачи', max_length=200)
+    payload = models.JSONField('Аргументы', default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES,
+                              default=PENDING)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField('Не раньше', default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'],
+                         name='outbox_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name}({self.payload}) [{self.status}]'
@@ -0,0 +1,186 @@
+"""
+Очередь фоновых задач с журналом в базе (outbox).
+
+Задача ставится вызовом `enqueue()` (или `func.delay()`) внутри
+транзакции записи и выполняется только после коммита. Режим задаёт
+TASK_QUEUE['MODE']:
+
+* 'thread' — строка outbox и запуск в пуле потоков процесса;
+  повторы по таймеру, осиротевшие задачи подбирает `run_worker`;
+* 'worker' — только строка outbox, выполняет `manage.py run_worker`;
+* 'eager' — функция вызывается сразу после коммита без outbox
+  (для тестов).
+
+Задачи выполняются «хотя бы раз», поэтому должны быть идемпотентны.
+"""
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxTask
+
+logger = logging.getLogger('posts.queue')
+
+registry = {}
+
+# Выполняется ли в этом контексте задача в режиме 'eager': её запросы
+# не относятся к запросу API, поставившему задачу (бюджет запросов).
+running_task = ContextVar('running_task', default=False)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def task(func):
+    """Регистрирует функцию как задачу и добавляет ей `delay()`."""
+    name = f'{func.__module__}.{func.__name__}'
+    registry[name] = func
+    func.task_name = name
+    func.delay = lambda **kwargs: enqueue(name, **kwargs)
+    return func
+
+
+def run_eager(func, kwargs):
+    token = running_task.set(True)
+    try:
+        return func(**kwargs)
+    finally:
+        running_task.reset(token)
+
+
+def enqueue(task_name, /, **kwargs):
+    """Ставит задачу `task_name` с аргументами `kwargs` после коммита."""
+    options = settings.TASK_QUEUE
+    if options['MODE'] == 'eager':
+        func = registry[task_name]
+        transaction.on_commit(lambda: run_eager(func, kwargs))
+        return None
+    outbox = OutboxTask.objects.create(
+        name=task_name, payload=kwargs,
+        max_attempts=options['MAX_ATTEMPTS'],
+    )
+    if options['MODE'] == 'thread':
+        transaction.on_commit(lambda: submit(outbox.pk))
+    return outbox
+
+
+def claim(task_id):
+    """Атомарно забирает задачу, если она ждёт или её аренда истекла."""
+    now = timezone.now()
+    return OutboxTask.objects.filter(
+        pk=task_id,
+        status__in=[OutboxTask.PENDING, OutboxTask.RUNNING],
+        run_at__lte=now,
+    ).update(
+        status=OutboxTask.RUNNING,
+        run_at=now + timedelta(seconds=settings.TASK_QUEUE['LEASE']),
+        attempts=F('attempts') + 1,
+    ) == 1
+
+
+def run_task(task_id):
+    """
+    Выполняет задачу, если удалось её забрать. Успешная задача
+    удаляется из outbox. Возвращает задержку до повтора в секундах
+    или None.
+    """
+    if not claim(task_id):
+        return None
+    outbox = OutboxTask.objects.get(pk=task_id)
+    try:
+        func = registry[outbox.name]
+        func(**outbox.payload)
+    except Exception:
+        return fail(outbox, traceback.format_exc())
+    OutboxTask.objects.filter(pk=task_id).delete()
+    return None
+
+
+def fail(outbox, error):
+    """Откладывает задачу с экспоненциальной задержкой или сдаётся."""
+    if outbox.name not in registry or outbox.attempts >= outbox.max_attempts:
+        logger.error('Задача %s #%s не выполнена: %s',
+                     outbox.name, outbox.pk, error)
+        OutboxTask.objects.filter(pk=outbox.pk).update(
+            status=OutboxTask.FAILED, last_error=error
+        )
+        return None
+    delay = settings.TASK_QUEUE['RETRY_DELAY'] * 2 ** (outbox.attempts - 1)
+    logger.warning('Задача %s #%s упала, повтор через %s с: %s',
+                   outbox.name, outbox.pk, delay, error)
+    OutboxTask.objects.filter(pk=outbox.pk).update(
+        status=OutboxTask.PENDING,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        last_error=error,
+    )
+    return delay
+
+
+def due_task_ids(limit):
+    return list(OutboxTask.objects.filter(
+        status__in=[OutboxTask.PENDING, OutboxTask.RUNNING],
+        run_at__lte=timezone.now(),
+    ).order_by('run_at').values_list('id', flat=True)[:limit])
+
+
+def run_due(limit=100, executor=None):
+    """
+    Выполняет до `limit` готовых к запуску задач — последовательно
+    или в пуле `executor` — и возвращает число обработанных.
+    """
+    task_ids = due_task_ids(limit)
+    if executor is None:
+        for task_id in task_ids:
+            run_task(task_id)
+    else:
+        list(executor.map(run_in_thread, task_ids))
+    return len(task_ids)
+
+
+def run_in_thread(task_id):
+    """run_task в потоке пула с собственным соединением с базой."""
+    close_old_connections()
+    try:
+        return run_task(task_id)
+    finally:
+        close_old_connections()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.TASK_QUEUE['WORKERS'],
+                thread_name_prefix='task-queue',
+            )
+    return _executor
+
+
+def submit(task_id, delay=0):
+    """Запускает задачу в пуле процесса, при `delay` — по таймеру."""
+    if delay:
+        timer = threading.Timer(delay, submit, (task_id,))
+        timer.daemon = True
+        timer.start()
+        return
+    get_executor().submit(_run_and_retry, task_id)
+
+
+def _run_and_retry(task_id):
+    try:
+        delay = run_in_thread(task_id)
+    except Exception:
+        # Например, база занята: задача остаётся в outbox для run_worker.
+        logger.exception('Не удалось запустить задачу #%s', task_id)
+        return
+    if delay is not None:
+        submit(task_id, delay)
@@ -0,0 +1,457 @@
+"""
+Полнотекстовый поиск по постам и комментариям и поиск подписок
+по имени автора.
+
+На SQLite с FTS5 поиск идёт по виртуальным таблицам `<таблица>_fts`
+с внешним содержимым (content=) поверх таблиц моделей. Их обновляют
+триггеры в той же транзакции, что и сами строки, — в том числе при
+bulk_create, update() и каскадном удалении. Таблицы и триггеры
+создаются после миграций (`install`).
+
+На остальных базах (или при SEARCH['BACKEND'] = 'memory') работает
+инвертированный индекс в памяти процесса: строится при первом поиске
+и обновляется сигналами save/delete после коммита. Изменения из других
+процессов он не видит — для этого есть `manage.py rebuild_search_index`.
+
+Подписки ищутся по нормализованной колонке Follow.following_name:
+по началу имени — диапазоном по индексу (user, following_name), по
+подстроке — через таблицу FTS5 с токенизатором trigram (SQLite 3.34+),
+а без неё — LIKE по той же колонке.
+
+Запрос разбивается на слова, находятся записи со всеми словами.
+Результат аннотируется полями search_rank (BM25, больше — лучше) и
+search_snippet — фрагментом текста с выделенными словами: текст
+экранирован для HTML, выделение — теги SEARCH['HIGHLIGHT'].
+"""
+import heapq
+import html
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import CharField, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Comment, Follow, Post, username_key
+
+# Модель -> индексируемая текстовая колонка.
+INDEXED = {Post: 'text', Comment: 'text'}
+# Модель -> колонка для поиска подстрок по триграммам.
+TRIGRAM_INDEXED = {Follow: 'following_name'}
+
+# Как токенизатор unicode61: буквы и цифры, без учёта регистра.
+WORD_RE = re.compile(r'[^\W_]+')
+ELLIPSIS = '…'
+# Метки выделения во фрагментах FTS5: символы из области частного
+# использования заменяются тегами уже после экранирования текста.
+MARK_START, MARK_END = '\ue000', '\ue001'
+
+# Параметры BM25, как в FTS5.
+K1 = 1.2
+B = 0.75
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def tokenize(text):
+    return [word.lower() for word in WORD_RE.findall(text)]
+
+
+@lru_cache(maxsize=None)
+def sqlite_supports(tokenizer):
+    """Собрана ли библиотека SQLite с FTS5 и токенизатором `tokenizer`."""
+    probe = sqlite3.connect(':memory:')
+    try:
+        probe.execute(
+            f"CREATE VIRTUAL TABLE probe USING fts5(text, "
+            f"tokenize='{tokenizer}')"
+        )
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def sqlite_has_fts5():
+    return sqlite_supports('unicode61')
+
+
+def fts_supported(connection):
+    return connection.vendor == 'sqlite' and sqlite_has_fts5()
+
+
+def uses_fts(connection):
+    """Ищет ли соединение через FTS5, а не через индекс в памяти."""
+    return (settings.SEARCH['BACKEND'] == 'auto'
+            and fts_supported(connection))
+
+
+def trigram_supported(connection):
+    return connection.vendor == 'sqlite' and sqlite_supports('trigram')
+
+
+def fts_indexes(connection):
+    """Таблицы FTS5 соединения: [(модель, колонка, токенизатор)]."""
+    indexes = []
+    if fts_supported(connection):
+        indexes += [(model, column, None) for model, column in INDEXED.items()]
+    if trigram_supported(connection):
+        indexes += [
+            (model, column, 'trigram')
+            for model, column in TRIGRAM_INDEXED.items()
+        ]
+    return indexes
+
+
+def fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def fts_statements(model, column, quote, tokenizer=None):
+    table = quote(model._meta.db_table)
+    fts = fts_table(model)
+    pk = quote(model._meta.pk.column)
+    column = quote(column)
+    delete = (f"INSERT INTO {quote(fts)}({quote(fts)}, rowid, {column}) "
+              f"VALUES ('delete', old.{pk}, old.{column});")
+    insert = (f'INSERT INTO {quote(fts)}(rowid, {column}) '
+              f'VALUES (new.{pk}, new.{column});')
+    options = f", tokenize='{tokenizer}'" if tokenizer else ''
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {quote(fts)} USING fts5("
+        f"{column}, content='{model._meta.db_table}', "
+        f"content_rowid='{model._meta.pk.column}'{options})",
+        f'CREATE TRIGGER IF NOT EXISTS {quote(fts + "_insert")} '
+        f'AFTER INSERT ON {table} BEGIN {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS {quote(fts + "_delete")} '
+        f'AFTER DELETE ON {table} BEGIN {delete} END',
+        f'CREATE TRIGGER IF NOT EXISTS {quote(fts + "_update")} '
+        f'AFTER UPDATE OF {column} ON {table} BEGIN {delete} {insert} END',
+    ]
+
+
+def install(connection):
+    """
+    Создаёт недостающие таблицы FTS5 и триггеры. Новые таблицы сразу
+    заполняются. Безопасно вызывать повторно: на SQLite миграция,
+    пересоздающая таблицу модели, удаляет и её триггеры.
+    """
+    indexes = fts_indexes(connection)
+    if not indexes:
+        return
+    existing = set(connection.introspection.table_names())
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for model, column, tokenizer in indexes:
+            if model._meta.db_table not in existing:
+                continue
+            statements = fts_statements(model, column, quote, tokenizer)
+            for statement in statements:
+                cursor.execute(statement)
+            if fts_table(model) not in existing:
+                rebuild_fts(cursor, model, quote)
+
+
+def rebuild_fts(cursor, model, quote):
+    fts = quote(fts_table(model))
+    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def rebuild(using='default'):
+    """
+    Перестраивает индексы всех моделей по текущим данным и
+    возвращает {модель: число записей}.
+    """
+    connection = connections[using]
+    reset()
+    indexes = fts_indexes(connection)
+    install(connection)
+    with connection.cursor() as cursor:
+        for model, _, _ in indexes:
+            rebuild_fts(cursor, model, connection.ops.quote_name)
+    models = list(INDEXED) + [model for model, _, _ in indexes
+                              if model not in INDEXED]
+    return {
+        model: model._default_manager.using(using).count()
+        for model in models
+    }
+
+
+def search(queryset, query):
+    """
+    Оставляет в `queryset` записи со всеми словами `query`, добавляет
+    search_rank и search_snippet и сортирует по релевантности.
+    """
+    words = tokenize(query)
+    if not words:
+        return nothing_found(queryset)
+    if uses_fts(connections[queryset.db]):
+        return fts_search(queryset, words)
+    return memory_search(queryset, words)
+
+
+def username_prefix(queryset, prefix):
+    """
+    Подписки на авторов, чьё имя начинается с `prefix`: диапазон
+    [prefix, prefix с увеличенным последним символом) по индексу.
+    """
+    low = username_key(prefix)
+    if not low:
+        return queryset
+    high = low[:-1] + chr(ord(low[-1]) + 1)
+    return queryset.filter(following_name__gte=low, following_name__lt=high)
+
+
+def username_contains(queryset, value):
+    """
+    Подписки на авторов, чьё имя содержит `value`. От трёх символов —
+    по триграммному индексу, короче — LIKE по нормализованной колонке.
+    """
+    key = username_key(value)
+    connection = connections[queryset.db]
+    if len(key) < 3 or not trigram_supported(connection):
+        return queryset.filter(following_name__contains=key)
+    fts = connection.ops.quote_name(fts_table(queryset.model))
+    phrase = '"{}"'.format(key.replace('"', '""'))
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', (phrase,)
+    ))
+
+
+def nothing_found(queryset):
+    # Пустой результат с теми же полями, что и у найденного.
+    return queryset.annotate(
+        search_rank=Value(0.0, output_field=FloatField()),
+        search_snippet=Value('', output_field=CharField()),
+    ).none()
+
+
+def fts_search(queryset, words):
+    model = queryset.model
+    quote = connections[queryset.db].ops.quote_name
+    fts = quote(fts_table(model))
+    # Каждое слово — строка в кавычках: спецсимволы синтаксиса FTS5
+    # из запроса пользователя не интерпретируются.
+    match = ' '.join(f'"{word}"' for word in words)
+    options = settings.SEARCH
+    return queryset.extra(
+        tables=[fts_table(model)],
+        where=[
+            f'{fts}.rowid = {quote(model._meta.db_table)}.'
+            f'{quote(model._meta.pk.column)}',
+            f'{fts} MATCH %s',
+        ],
+        params=[match],
+    ).annotate(
+        search_rank=RawSQL(f'-bm25({fts})', (), output_field=FloatField()),
+        search_snippet=RawSQL(
+            f'snippet({fts}, 0, %s, %s, %s, %s)',
+            (MARK_START, MARK_END, ELLIPSIS, options['SNIPPET_WORDS']),
+            output_field=SnippetField(),
+        ),
+    ).order_by('-search_rank', '-pk')
+
+
+class SnippetField(CharField):
+    """
+    Фрагмент от snippet() FTS5 с метками MARK_START/MARK_END:
+    при чтении из базы текст экранируется, а метки заменяются тегами.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        start, end = settings.SEARCH['HIGHLIGHT']
+        return html.escape(value).replace(MARK_START, start).replace(
+            MARK_END, end)
+
+
+def memory_search(queryset, words):
+    index = get_index(queryset.model, queryset.db)
+    # У отобранного queryset (комментарии поста, фильтры списка) лучшие
+    # записи индекса могут лежать вне отбора и вытеснить подходящие,
+    # поэтому ограничение MAX_RESULTS только для полного набора.
+    limit = None
+    if not queryset.query.has_filters():
+        limit = settings.SEARCH['MAX_RESULTS']
+    found = index.search(words, limit)
+    if not found:
+        return nothing_found(queryset)
+    snippets = [(pk, index.snippet(pk, words)) for pk, _ in found]
+    return queryset.filter(pk__in=[pk for pk, _ in found]).annotate(
+        search_rank=case_by_pk(queryset, found, FloatField()),
+        search_snippet=case_by_pk(queryset, snippets, CharField()),
+    ).order_by('-search_rank', '-pk')
+
+
+def case_by_pk(queryset, values, output_field):
+    """
+    CASE pk WHEN ... THEN ... END по парам (pk, значение). Одно
+    выражение RawSQL собирается в разы быстрее, чем When на каждую
+    запись.
+    """
+    model = queryset.model
+    quote = connections[queryset.db].ops.quote_name
+    column = f'{quote(model._meta.db_table)}.{quote(model._meta.pk.column)}'
+    sql = f'CASE {column}' + ' WHEN %s THEN %s' * len(values) + ' END'
+    params = [item for pair in values for item in pair]
+    return RawSQL(sql, params, output_field=output_field)
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс в памяти: слово -> {id записи: частота}.
+    Хранит тексты записей для фрагментов, поэтому рассчитан на
+    небольшие базы.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = {}
+        self.lengths = {}
+        self.texts = {}
+        self.total_length = 0
+
+    def add(self, pk, text):
+        with self.lock:
+            self.remove(pk)
+            words = Counter(tokenize(text))
+            for word, count in words.items():
+                self.postings.setdefault(word, {})[pk] = count
+            self.texts[pk] = text
+            self.lengths[pk] = sum(words.values())
+            self.total_length += self.lengths[pk]
+
+    def remove(self, pk):
+        with self.lock:
+            text = self.texts.pop(pk, None)
+            if text is None:
+                return
+            for word in set(tokenize(text)):
+                documents = self.postings[word]
+                del documents[pk]
+                if not documents:
+                    del self.postings[word]
+            self.total_length -= self.lengths.pop(pk)
+
+    def search(self, words, limit=None):
+        """
+        До `limit` (None — без ограничения) записей со всеми словами:
+        [(id, оценка BM25)] по убыванию оценки.
+        """
+        with self.lock:
+            postings = [self.postings.get(word) for word in set(words)]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            matched = set(postings[0]).intersection(*postings[1:])
+            total = len(self.lengths)
+            average = self.total_length / total
+            weights = [
+                (documents, self.idf(total, len(documents)))
+                for documents in postings
+            ]
+            scores = []
+            for pk in matched:
+                norm = K1 * (1 - B + B * self.lengths[pk] / average)
+                score = sum(
+                    idf * documents[pk] * (K1 + 1) / (documents[pk] + norm)
+                    for documents, idf in weights
+                )
+                scores.append((pk, score))
+        if limit is None:
+            return sorted(scores, key=lambda item: item[::-1], reverse=True)
+        return heapq.nlargest(limit, scores, key=lambda item: item[::-1])
+
+    @staticmethod
+    def idf(total, found):
+        # Как в FTS5: у слов из большинства записей вес почти нулевой.
+        return max(math.log((total - found + 0.5) / (found + 0.5)), 1e-6)
+
+    def snippet(self, pk, words):
+        """Фрагмент текста записи вокруг первого найденного слова."""
+        with self.lock:
+            text = self.texts.get(pk, '')
+        return make_snippet(text, set(words))
+
+
+def make_snippet(text, words):
+    """Фрагмент текста для HTML: текст экранирован, слова выделены."""
+    options = settings.SEARCH
+    size = options['SNIPPET_WORDS']
+    start_mark, end_mark = options['HIGHLIGHT']
+    tokens = list(WORD_RE.finditer(text))
+    hits = [
+        position for position, token in enumerate(tokens)
+        if token.group().lower() in words
+    ]
+    first = hits[0] - size // 4 if hits else 0
+    first = max(min(first, len(tokens) - size), 0)
+    window = tokens[first:first + size]
+    if not window:
+        return html.escape(text)
+    parts = [ELLIPSIS] if first else []
+    cursor = window[0].start() if first else 0
+    for token in window:
+        parts.append(html.escape(text[cursor:token.start()]))
+        if token.group().lower() in words:
+            parts.append(f'{start_mark}{html.escape(token.group())}'
+                         f'{end_mark}')
+        else:
+            parts.append(html.escape(token.group()))
+        cursor = token.end()
+    if first + size < len(tokens):
+        parts.append(ELLIPSIS)
+    else:
+        parts.append(html.escape(text[cursor:]))
+    return ''.join(parts)
+
+
+def get_index(model, using='default'):
+    """Индекс модели в памяти процесса; строится при первом обращении."""
+    with _indexes_lock:
+        index = _indexes.get(model)
+        if index is None:
+            index = InvertedIndex()
+            column = INDEXED[model]
+            rows = model._default_manager.using(using).values_list(
+                'pk', column)
+            for pk, text in rows.iterator():
+                index.add(pk, text)
+            _indexes[model] = index
+    return index
+
+
+def object_saved(instance):
+    """Обновляет индекс в памяти после коммита сохранения записи."""
+    index = _indexes.get(type(instance))
+    if index is not None:
+        pk, text = instance.pk, getattr(instance, INDEXED[type(instance)])
+        transaction.on_commit(lambda: index.add(pk, text))
+
+
+def object_deleted(instance):
+    """Убирает запись из индекса в памяти после коммита удаления."""
+    index = _indexes.get(type(instance))
+    if index is not None:
+        pk = instance.pk
+        transaction.on_commit(lambda: index.remove(pk))
+
+
+def objects_created(objs):
+    """Записи из bulk_create: сигналы save для них не отправляются."""
+    for instance in objs:
+        object_saved(instance)
+
+
+def reset():
+    """Сбрасывает индексы в памяти, например после импорта."""
+    with _indexes_lock:
+        _indexes.clear()
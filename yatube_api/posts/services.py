@@ -0,0 +1,220 @@
+import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (
+    Count, DateTimeField, F, OuterRef, Q, Subquery, Value
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import search
+from .models import AuthorStats, Comment, FeedEntry, Follow, Post
+
+
+def _comments_count():
+    return Subquery(
+        Comment.objects.filter(post=OuterRef('pk'))
+        .values('post')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+
+
+def _last_comment_at():
+    return Subquery(
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by('-created')
+        .values('created')[:1]
+    )
+
+
+def touch_posts(**filters):
+    """Сдвигает отметку изменения постов, чей ответ API поменялся."""
+    return Post.objects.filter(**filters).update(modified=timezone.now())
+
+
+def rebuild_comment_counters():
+    """
+    Пересчитывает счётчики комментариев всех постов одним запросом.
+    Обновляет только посты с неверными счётчиками и сдвигает их
+    отметку изменения; возвращает число таких постов.
+    """
+    # Отсутствие комментариев сравнивается через заведомо меньшую дату:
+    # сравнение с NULL не отличило бы NULL от даты.
+    never = Value(datetime.datetime.min.replace(tzinfo=datetime.timezone.utc),
+                  output_field=DateTimeField())
+    stale = Post.objects.annotate(
+        actual_count=Coalesce(_comments_count(), 0),
+        stored_last=Coalesce('last_comment_at', never),
+        actual_last=Coalesce(_last_comment_at(), never),
+    ).filter(
+        ~Q(comments_count=F('actual_count'))
+        | ~Q(stored_last=F('actual_last'))
+    ).values('pk')
+    return Post.objects.filter(pk__in=stale).update(
+        comments_count=Coalesce(_comments_count(), 0),
+        last_comment_at=_last_comment_at(),
+        modified=timezone.now(),
+    )
+
+
+def refresh_comment_counters(**filters):
+    """
+    Пересчитывает счётчики выбранных постов по их комментариям.
+    Повторный вызов безопасен, поэтому подходит для фоновых задач
+    с повторами.
+    """
+    return Post.objects.filter(**filters).update(
+        comments_count=Coalesce(_comments_count(), 0),
+        last_comment_at=_last_comment_at(),
+        modified=timezone.now(),
+    )
+
+
+@transaction.atomic
+def bulk_create_posts(author_id, items):
+    """
+    Создаёт посты автора одним INSERT-пакетом в одной транзакции
+    и возвращает их с авторами. Раскладку по лентам ставит вызывающий.
+    """
+    posts = Post.objects.bulk_create(
+        [Post(author_id=author_id, **item) for item in items],
+        batch_size=500
+    )
+    if not posts:
+        return posts
+    created = Post.objects.select_related('author').order_by('id')
+    if connection.features.can_return_rows_from_bulk_insert:
+        created = created.filter(id__in=[post.id for post in posts])
+    else:
+        # Бэкенд не вернул id. Транзакция держит блокировку записи,
+        # поэтому вставленные строки — последние посты автора.
+        created = created.filter(id__in=Post.objects.filter(
+            author_id=author_id).order_by('-id').values('id')[:len(posts)])
+    created = list(created)
+    search.objects_created(created)
+    return created
+
+
+def follower_added(author_id):
+    """Увеличивает счётчик подписчиков автора."""
+    # Строка может уже быть, в том числе от параллельной подписки:
+    # вставка без ошибки, затем атомарное увеличение.
+    AuthorStats.objects.bulk_create([AuthorStats(author_id=author_id)],
+                                    ignore_conflicts=True)
+    AuthorStats.objects.filter(author_id=author_id).update(
+        followers_count=F('followers_count') + 1)
+
+
+def follower_removed(author_id):
+    """Уменьшает счётчик подписчиков автора."""
+    AuthorStats.objects.filter(
+        author_id=author_id, followers_count__gt=0
+    ).update(followers_count=F('followers_count') - 1)
+
+
+@transaction.atomic
+def rebuild_follower_counters():
+    """Пересчитывает счётчики подписчиков всех авторов."""
+    counts = Follow.objects.values('following_id').annotate(
+        total=Count('id')).values_list('following_id', 'total')
+    AuthorStats.objects.all().delete()
+    return len(AuthorStats.objects.bulk_create(
+        (AuthorStats(author_id=author_id, followers_count=total)
+         for author_id, total in counts.iterator()),
+        batch_size=1000,
+    ))
+
+
+def _is_fanout_author(author_id):
+    return not AuthorStats.objects.filter(
+        author_id=author_id,
+        followers_count__gt=settings.FEED_FANOUT_MAX_FOLLOWERS,
+    ).exists()
+
+
+def fan_out_posts(posts):
+    """
+    Раскладывает новые посты в ленты подписчиков их авторов.
+    Посты авторов с большим числом подписчиков пропускаются:
+    их читатели получают ленту через fan-out on read.
+    """
+    entries = []
+    by_author = {}
+    for post in posts:
+        by_author.setdefault(post.author_id, []).append(post)
+    for author_id, author_posts in by_author.items():
+        if not _is_fanout_author(author_id):
+            continue
+        followers = Follow.objects.filter(
+            following_id=author_id).values_list('user_id', flat=True)
+        entries.extend(
+            FeedEntry(owner_id=user_id, post_id=post.id)
+            for user_id in followers.iterator()
+            for post in author_posts
+        )
+    FeedEntry.objects.bulk_create(entries, batch_size=500,
+                                  ignore_conflicts=True)
+    return len(entries)
+
+
+def fan_out_post(post):
+    """Раскладывает новый пост в ленты подписчиков автора."""
+    return fan_out_posts([post])
+
+
+def backfill_feed(follow):
+    """Добавляет в ленту подписчика последние посты нового автора."""
+    if not _is_fanout_author(follow.following_id):
+        return 0
+    post_ids = Post.objects.filter(
+        author_id=follow.following_id
+    ).order_by('-pub_date', '-id').values_list(
+        'id', flat=True
+    )[:settings.FEED_BACKFILL_POSTS]
+    entries = [
+        FeedEntry(owner_id=follow.user_id, post_id=post_id)
+        for post_id in post_ids
+    ]
+    FeedEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+def rebuild_feeds():
+    """Заполняет ленты по всем подпискам, например после импорта."""
+    total = 0
+    for follow in Follow.objects.only('user_id', 'following_id').iterator():
+        total += backfill_feed(follow)
+    return total
+
+
+def prune_feed(follow):
+    """Убирает из ленты подписчика посты автора, от которого он отписался."""
+    return FeedEntry.objects.filter(
+        owner_id=follow.user_id, post__author_id=follow.following_id
+    ).delete()[0]
+
+
+def follows_heavy_authors(user_id):
+    """Подписан ли пользователь на авторов без fan-out on write."""
+    return Follow.objects.filter(
+        user_id=user_id,
+        following__stats__followers_count__gt=(
+            settings.FEED_FANOUT_MAX_FOLLOWERS),
+    ).exists()
+
+
+def feed_posts(user_id, strategy=None):
+    """
+    Посты из ленты пользователя.
+
+    `strategy` — 'write' (предрассчитанная таблица FeedEntry) или
+    'read' (join по подпискам); по умолчанию выбирается 'read' только
+    для подписчиков авторов, чьи посты не раскладываются по лентам.
+    """
+    if strategy is None:
+        strategy = 'read' if follows_heavy_authors(user_id) else 'write'
+    if strategy == 'read':
+        return Post.objects.filter(author__followers__user_id=user_id)
+    return Post.objects.filter(feed_entries__owner_id=user_id)
@@ -0,0 +1,116 @@
+from django.db import connections
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_delete, pre_save
+)
+from django.dispatch import Signal, receiver
+
+from django.conf import settings
+
+from . import queue, search, services
+from .models import Comment, Follow, Group, Post, User, username_key
+
+# Массовая запись в обход save(): импорт, bulk_create и т.п.
+data_imported = Signal()
+# Посты изменены через update() вне запроса, например фоновой задачей.
+posts_changed = Signal()
+
+
+@receiver(pre_save, sender=Follow)
+def follow_saving(sender, instance, **kwargs):
+    """Заполняет имя автора для поиска подписок."""
+    if not instance.following_name:
+        instance.following_name = username_key(instance.following.username)
+
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance, update_fields=None, **kwargs):
+    """Запоминает прежнее имя пользователя, чтобы заметить переименование."""
+    instance._previous_username = None
+    if instance.pk is None or (update_fields is not None
+                               and 'username' not in update_fields):
+        return
+    instance._previous_username = User.objects.filter(
+        pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def user_renamed(sender, instance, created, **kwargs):
+    """
+    После переименования обновляет имя автора в его подписчиках
+    и отметки изменения постов, в ответах которых есть это имя:
+    его постов и постов с его комментариями.
+    """
+    previous = getattr(instance, '_previous_username', None)
+    if created or previous is None or previous == instance.username:
+        return
+    name = username_key(instance.username)
+    Follow.objects.filter(following_id=instance.pk).exclude(
+        following_name=name).update(following_name=name)
+    services.touch_posts(author_id=instance.pk)
+    services.touch_posts(comments__author_id=instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, **kwargs):
+    """Учитывает нового подписчика в счётчике автора."""
+    if created:
+        services.follower_added(instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    """Чистит ленту подписчика после отписки."""
+    services.follower_removed(instance.following_id)
+    queue.enqueue('posts.tasks.prune_feed', user_id=instance.user_id,
+                  following_id=instance.following_id)
+
+
+@receiver(pre_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    """Посты удаляемой группы потеряют поле group без вызова save()."""
+    services.touch_posts(group=instance)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, **kwargs):
+    """Заранее готовит уменьшенные копии изображения поста."""
+    if instance.image and settings.POST_IMAGES['PREGENERATE']:
+        queue.enqueue('posts.tasks.generate_image_variants',
+                      name=instance.image.name)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    """Удаляет уменьшенные копии изображения удалённого поста."""
+    if instance.image:
+        queue.enqueue('posts.tasks.delete_image_variants',
+                      name=instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def searchable_saved(sender, instance, update_fields=None, **kwargs):
+    """Переиндексирует текст записи в поисковом индексе в памяти."""
+    if update_fields is None or search.INDEXED[sender] in update_fields:
+        search.object_saved(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def searchable_deleted(sender, instance, **kwargs):
+    search.object_deleted(instance)
+
+
+@receiver(data_imported)
+def search_data_imported(sender, **kwargs):
+    search.reset()
+
+
+@receiver(post_migrate)
+def search_schema_migrated(sender, using, **kwargs):
+    """
+    Создаёт таблицы FTS5 и триггеры поиска. Проверяется после каждой
+    миграции: пересоздание таблицы модели на SQLite удаляет триггеры.
+    """
+    if sender.name == 'posts':
+        search.install(connections[using])
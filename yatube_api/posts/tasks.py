@@ -0,0 +1,47 @@
+"""Фоновые задачи, вынесенные из обработки запросов на запись."""
+from . import images, services
+from .models import Follow, Post
+from .queue import task
+from .signals import posts_changed
+
+
+@task
+def fan_out_posts(post_ids):
+    """Раскладывает посты по лентам подписчиков их авторов."""
+    posts = list(Post.objects.filter(pk__in=post_ids).only('id', 'author'))
+    return services.fan_out_posts(posts)
+
+
+@task
+def refresh_comment_counters(post_id):
+    """Пересчитывает счётчики комментариев поста."""
+    if services.refresh_comment_counters(pk=post_id):
+        posts_changed.send(sender=Post)
+
+
+@task
+def backfill_feed(user_id, following_id):
+    """Добавляет в ленту подписчика последние посты автора."""
+    if Follow.objects.filter(user_id=user_id,
+                             following_id=following_id).exists():
+        services.backfill_feed(
+            Follow(user_id=user_id, following_id=following_id)
+        )
+
+
+@task
+def prune_feed(user_id, following_id):
+    """Убирает из ленты посты автора после отписки."""
+    services.prune_feed(Follow(user_id=user_id, following_id=following_id))
+
+
+@task
+def generate_image_variants(name):
+    """Создаёт уменьшенные копии изображения поста."""
+    images.generate_variants(name)
+
+
+@task
+def delete_image_variants(name):
+    """Удаляет уменьшенные копии изображения удалённого поста."""
+    images.delete_variants(name)
@@ -24,6 +24,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.QueryBudgetMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +65,26 @@ DATABASES = {
     }
 }
 
+# Алиасы реплик из DATABASES для чтения в безопасных запросах API.
+DATABASE_REPLICAS = []
+
+DATABASE_ROUTERS = ['api.db_router.ReplicaRouter']
+
+# После записи клиент читает из основной базы WINDOW секунд.
+READ_YOUR_WRITES = {
+    'WINDOW': 5,
+    'COOKIE': 'read_primary_until',
+}
+
+# Пул потоков для работы с базой в асинхронных эндпоинтах api.async_views.
+ASYNC_DB_POOL = {
+    'MAX_WORKERS': 8,
+}
+
+# PRAGMA, выполняемые при открытии каждого соединения с SQLite
+# (api.signals.apply_sqlite_pragmas); см. settings_production.
+SQLITE_PRAGMAS = {}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -88,16 +110,120 @@ USE_L10N = True
 
 USE_TZ = True
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+}
+
+# Кэш ответов на анонимные GET-запросы; ALIAS — ключ из CACHES.
+API_RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
 STATIC_URL = '/static/'
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Изображения постов (posts.images): ограничения загрузки и размеры
+# уменьшенных копий по большей стороне. PREGENERATE = False — копии
+# создаются только при первом запросе.
+POST_IMAGES = {
+    'MAX_BYTES': 5 * 1024 * 1024,
+    'MAX_WIDTH': 6000,
+    'MAX_HEIGHT': 6000,
+    'UPLOAD_FORMATS': ('jpeg', 'png', 'webp'),
+    'SIZES': {'small': 320, 'medium': 640, 'large': 1280},
+    'FORMATS': ('webp', 'jpeg'),
+    'QUALITY': 80,
+    'PREGENERATE': True,
+}
+
+# Фоновые задачи (posts.queue). MODE: 'thread' — пул потоков процесса,
+# 'worker' — только outbox для manage.py run_worker, 'eager' — сразу
+# после коммита. RETRY_DELAY удваивается с каждой попыткой, LEASE —
+# секунды, после которых зависшую задачу забирает другой обработчик.
+TASK_QUEUE = {
+    'MODE': 'thread',
+    'WORKERS': 4,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 2,
+    'LEASE': 300,
+}
+
+# Полнотекстовый поиск posts.search: BACKEND 'auto' — FTS5 на SQLite, где
+# она есть, иначе индекс в памяти процесса; 'memory' — всегда индекс в
+# памяти. MAX_RESULTS ограничивает выдачу индекса в памяти для запросов
+# без фильтров (для отобранных записей выдача полная), SNIPPET_WORDS —
+# длину фрагмента в словах.
+SEARCH = {
+    'BACKEND': 'auto',
+    'MAX_RESULTS': 1000,
+    'SNIPPET_WORDS': 12,
+    'HIGHLIGHT': ('<b>', '</b>'),
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
 
+# Пагинация списков API по `pagination_scope` представления
+# (api.pagination): DEFAULT_LIMIT — размер страницы без параметра limit,
+# MAX_LIMIT — наибольший допустимый limit.
+API_PAGINATION = {
+    'posts': {'DEFAULT_LIMIT': 20, 'MAX_LIMIT': 100},
+    'feed': {'DEFAULT_LIMIT': 10, 'MAX_LIMIT': 100},
+    'comments': {'DEFAULT_LIMIT': 50, 'MAX_LIMIT': 200},
+    'groups': {'DEFAULT_LIMIT': 100, 'MAX_LIMIT': 100},
+    'follow': {'DEFAULT_LIMIT': 50, 'MAX_LIMIT': 200},
+}
+
+# Кэш состояния пользователей для api.authentication.StatelessJWTAuthentication.
+JWT_USER_STATE_CACHE = {
+    'TTL': 30,
+    'MAX_SIZE': 10000,
+}
+
+# Таблица групп в памяти процесса (api.groups.GroupCache): перечитывается
+# не реже чем раз в TTL секунд.
+GROUP_CACHE = {
+    'TTL': 30,
+}
+
+# LRU-кэш проверенных JWT; MAX_SIZE = 0 отключает кэш.
+JWT_TOKEN_CACHE = {
+    'MAX_SIZE': 10000,
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Превышение `query_budget` представления пишется в лог api.query_budget;
+# с RAISE = True запрос падает с QueryBudgetExceeded (включено в тестах).
+QUERY_BUDGET = {
+    'RAISE': False,
+}
+
+# Максимальный размер пакета для POST /api/v1/posts/bulk/.
+POSTS_BULK_CREATE_MAX = 500
+
+# Авторы с большим числом подписчиков не раскладываются по лентам при
+# публикации: их подписчики читают ленту через join по Follow.
+FEED_FANOUT_MAX_FOLLOWERS = 1000
+# Сколько последних постов автора добавляется в ленту при подписке.
+FEED_BACKFILL_POSTS = 100
@@ -0,0 +1,43 @@
+"""
+Профиль для работы под нагрузкой на SQLite:
+
+    DJANGO_SETTINGS_MODULE=yatube_api.settings_production
+
+WAL позволяет читателям не ждать писателя, а busy timeout заставляет
+конкурирующих писателей ждать блокировку вместо
+«database is locked». Транзакции начинаются с BEGIN IMMEDIATE
+(yatube_api.sqlite_backend): иначе писатель, начавший транзакцию
+чтением, получает ошибку сразу, не дожидаясь busy timeout.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'yatube_api.sqlite_backend',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение переиспользуется между запросами, PRAGMA выполняются
+        # один раз на соединение.
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            # Секунды ожидания блокировки в sqlite3.connect.
+            'timeout': 20,
+        },
+    }
+}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в КиБ.
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
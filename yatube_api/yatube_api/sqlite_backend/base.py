@@ -0,0 +1,17 @@
+"""
+Бэкенд SQLite, начинающий транзакции с BEGIN IMMEDIATE.
+
+Транзакция после обычного BEGIN берёт блокировку записи только при
+первой записи, и если её держит другой писатель, SQLite сразу
+возвращает «database is locked»: ожидание busy timeout при таком
+повышении блокировки не помогает. BEGIN IMMEDIATE берёт блокировку
+в начале транзакции, и конкурирующие транзакции ждут busy timeout.
+В режиме WAL читатели при этом не блокируются.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')